@@ -1,11 +1,19 @@
 from __future__ import annotations
 
 import json
+import logging
 import sys
+import threading
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Deque, Dict, Optional
+
+# Lines are formatted on the caller's thread and written by a background flusher, so
+# emit() never blocks the loop on stdout/file I/O.
+_FLUSH_INTERVAL_SEC = 0.1
+_MAX_PENDING_LINES = 65_536
 
 
 @dataclass
@@ -16,6 +24,15 @@ class MetricsEmitter:
         path = Path(self.metrics_log_path)
         path.parent.mkdir(parents=True, exist_ok=True)
         self._file = path.open("a", encoding="utf-8")
+        self._pending: Deque[str] = deque(maxlen=_MAX_PENDING_LINES)
+        # Lines evicted because the writer fell behind; reported on the next flush.
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._writer = threading.Thread(
+            target=self._flush_loop, name="metrics-writer", daemon=True
+        )
+        self._writer.start()
 
     def emit(self, name: str, value: float, tags: Optional[Dict[str, Any]] = None) -> None:
         payload = {
@@ -24,10 +41,44 @@ class MetricsEmitter:
             "value": value,
             "tags": tags or {},
         }
-        line = f"[METRICS] {json.dumps(payload, ensure_ascii=True)}"
-        print(line, file=sys.stdout)
-        self._file.write(line + "\n")
+        pending = self._pending
+        if len(pending) == pending.maxlen:
+            with self._dropped_lock:
+                self._dropped += 1
+        pending.append(f"[METRICS] {json.dumps(payload, ensure_ascii=True)}")
+
+    def _flush_loop(self) -> None:
+        stopping = False
+        while not stopping:
+            stopping = self._stop.wait(_FLUSH_INTERVAL_SEC)
+            try:
+                self._flush()
+            except Exception:
+                # Keep the writer alive; a dead thread would silently stop all metrics.
+                logging.getLogger("hyperliquid").exception("metrics_flush_failed")
+
+    def _flush(self) -> None:
+        lines = []
+        pop = self._pending.popleft
+        while True:
+            try:
+                lines.append(pop())
+            except IndexError:
+                break
+        with self._dropped_lock:
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            logging.getLogger("hyperliquid").warning(
+                "metrics_lines_dropped", extra={"dropped_lines": dropped}
+            )
+        if not lines:
+            return
+        text = "\n".join(lines) + "\n"
+        sys.stdout.write(text)
+        self._file.write(text)
         self._file.flush()
 
     def close(self) -> None:
+        self._stop.set()
+        self._writer.join()
         self._file.close()
@@ -1,16 +1,27 @@
 from __future__ import annotations
 
+import copy
 import hashlib
 import json
+import sys
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import jsonschema
 import yaml
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional runtime dependency
+    orjson = None
 
-@dataclass(frozen=True)
+# libyaml bindings are optional; fall back to the pure-Python loader.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@dataclass(frozen=True, slots=True)
 class Settings:
     config_version: str
     environment: str
@@ -28,23 +39,61 @@ def compute_config_hash(config_path: Path) -> str:
 
 
 def load_yaml(path: Path) -> Dict[str, Any]:
-    data = yaml.safe_load(path.read_text())
+    data = yaml.load(path.read_text(), Loader=_YAML_LOADER)
     return data or {}
 
 
+@lru_cache(maxsize=8)
+def _compiled_validator(schema_key: str, mtime_ns: int, size: int) -> Any:
+    # mtime/size are part of the key so an edited schema is picked up.
+    raw = Path(schema_key).read_bytes()
+    schema = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
+def _intern_strings(value: Any) -> Any:
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {
+            sys.intern(k) if isinstance(k, str) else k: _intern_strings(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_intern_strings(v) for v in value]
+    return value
+
+
 def validate_config(config: Dict[str, Any], schema_path: Path) -> None:
-    schema = json.loads(schema_path.read_text())
-    jsonschema.validate(instance=config, schema=schema)
+    stat = schema_path.stat()
+    validator = _compiled_validator(str(schema_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    error = jsonschema.exceptions.best_match(validator.iter_errors(config))
+    if error is not None:
+        raise error
 
 
-def load_settings(config_path: Path, schema_path: Path) -> Settings:
+def load_settings(config_path: Path, schema_path: Path, *, validate: bool = True) -> Settings:
     if not config_path.exists():
         raise FileNotFoundError(f"Config file not found: {config_path}")
-    if not schema_path.exists():
+    if validate and not schema_path.exists():
         raise FileNotFoundError(f"Schema file not found: {schema_path}")
 
-    config = load_yaml(config_path)
-    validate_config(config, schema_path)
+    # Repeat loads in one process (ops tools, tests) reuse the parsed and validated
+    # config until either file changes on disk. Each caller gets its own copy, so
+    # mutating settings.raw never leaks into later loads.
+    config_stat = config_path.stat()
+    schema_stat = schema_path.stat() if validate else None
+    config = _load_config_cached(
+        str(config_path.resolve()),
+        config_stat.st_mtime_ns,
+        config_stat.st_size,
+        str(schema_path.resolve()) if validate else None,
+        schema_stat.st_mtime_ns if schema_stat else None,
+        schema_stat.st_size if schema_stat else None,
+    )
+    config = copy.deepcopy(config)
 
     return Settings(
         config_version=str(config["config_version"]),
@@ -56,3 +105,18 @@ def load_settings(config_path: Path, schema_path: Path) -> Settings:
         config_path=config_path,
         raw=config,
     )
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(
+    config_key: str,
+    config_mtime_ns: int,
+    config_size: int,
+    schema_key: Optional[str],
+    schema_mtime_ns: Optional[int],
+    schema_size: Optional[int],
+) -> Dict[str, Any]:
+    config = load_yaml(Path(config_key))
+    if schema_key is not None:
+        validate_config(config, Path(schema_key))
+    return _intern_strings(config)
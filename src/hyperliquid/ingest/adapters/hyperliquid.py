@@ -1,42 +1,89 @@
 from __future__ import annotations
 
+import base64
 import json
 import logging
 import os
 import random
+import sys
 import threading
 import time
+from bisect import bisect_left, bisect_right
 from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field, replace
-from typing import Deque, Iterable, List, Optional
-from urllib import error as url_error
+from functools import lru_cache
+from http import client as http_client
+from types import MappingProxyType
+from typing import Deque, Iterable, Iterator, List, Mapping, Optional
 from urllib import request as url_request
+from urllib.parse import SplitResult, unquote, urlsplit
 
 try:
-    import websocket
+    import orjson
 except ImportError:  # pragma: no cover - optional runtime dependency
-    websocket = None
+    orjson = None
 
 from hyperliquid.ingest.service import RawPositionEvent
 
 
-@dataclass(frozen=True)
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the stdlib type.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_dumps(payload: object) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _import_websocket():
+    # Deferred so stub/backfill-only adapters never load websocket-client (and ssl).
+    try:
+        import websocket
+    except ImportError:  # pragma: no cover - optional runtime dependency
+        return None
+    return websocket
+
+
+def _as_int(value: object) -> int:
+    # Fill times and tids already arrive as ints; skip the int() call for them.
+    return value if type(value) is int else int(value)
+
+
+def _as_float(value: object) -> float:
+    return value if type(value) is float else float(value)
+
+
+def _fill_sort_key(fill: dict) -> tuple[int, int]:
+    return _as_int(fill.get("time", 0)), _as_int(fill.get("tid", 0))
+
+
+@dataclass(frozen=True, slots=True)
 class RetryPolicy:
     max_attempts: int
     base_delay_ms: int
     max_delay_ms: int
     jitter_ms: int
 
-    def next_delay_ms(self, attempt: int) -> int:
+    def next_delay_ms(self, attempt: int, prev_delay_ms: Optional[int] = None) -> int:
+        # The first retry uses capped exponential backoff plus up to ``jitter_ms``. Once a
+        # caller passes the previous delay, decorrelated jitter takes over: it spreads
+        # retries over [base, 3 * prev] so concurrent clients drift apart, and ignores
+        # ``attempt`` and ``jitter_ms``.
+        if prev_delay_ms is not None:
+            low = max(self.base_delay_ms, 0)
+            high = max(prev_delay_ms * 3, low)
+            return min(self.max_delay_ms, low + int(random.random() * (high - low + 1)))
         if attempt < 1:
             attempt = 1
-        delay = self.base_delay_ms * (2 ** (attempt - 1))
-        delay = min(delay, self.max_delay_ms)
-        jitter = random.randint(0, max(self.jitter_ms, 0))
-        return max(0, delay + jitter)
+        delay = min(self.base_delay_ms * (2 ** (attempt - 1)), self.max_delay_ms)
+        if self.jitter_ms > 0:
+            delay += int(random.random() * (self.jitter_ms + 1))
+        return max(0, delay)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RateLimitPolicy:
     max_requests: int
     per_seconds: int
@@ -44,20 +91,27 @@ class RateLimitPolicy:
 
 
 class RateLimiter:
+    __slots__ = ("_policy", "_window_ns", "_ring", "_head")
+
     def __init__(self, policy: RateLimitPolicy) -> None:
         self._policy = policy
-        self._requests: Deque[float] = deque()
+        self._window_ns = policy.per_seconds * 1_000_000_000
+        # Admission times (monotonic ns) of the last ``max_requests`` requests; ``_head``
+        # is the oldest. Unused slots hold a time far enough back to always admit.
+        self._ring: List[int] = [-(1 << 62)] * max(policy.max_requests, 0)
+        self._head = 0
 
     def allow(self) -> bool:
-        if self._policy.max_requests <= 0 or self._policy.per_seconds <= 0:
+        ring = self._ring
+        window_ns = self._window_ns
+        if not ring or window_ns <= 0:
             return True
-        now = time.time()
-        window_start = now - self._policy.per_seconds
-        while self._requests and self._requests[0] < window_start:
-            self._requests.popleft()
-        if len(self._requests) >= self._policy.max_requests:
+        now = time.monotonic_ns()
+        head = self._head
+        if ring[head] >= now - window_ns:
             return False
-        self._requests.append(now)
+        ring[head] = now
+        self._head = (head + 1) % len(ring)
         return True
 
     @property
@@ -65,7 +119,7 @@ class RateLimiter:
         return max(self._policy.cooldown_seconds, 0)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HyperliquidIngestConfig:
     enabled: bool
     mode: str
@@ -75,77 +129,120 @@ class HyperliquidIngestConfig:
     request_timeout_ms: int
     backfill_window_ms: int
     cursor_overlap_ms: int
-    symbol_map: dict[str, str]
+    symbol_map: Mapping[str, str]
     rate_limit: RateLimitPolicy
     retry: RetryPolicy
-    stub_events: List[RawPositionEvent] = field(default_factory=list)
+    stub_events: tuple[RawPositionEvent, ...] = ()
+    # Timestamps of the dated prefix of ``stub_events`` (sorted ascending);
+    # undated stub events follow that prefix and are stamped at poll time.
+    stub_timestamps: tuple[int, ...] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        stub_events, stub_timestamps = _index_stub_events(self.stub_events)
+        object.__setattr__(self, "stub_events", stub_events)
+        object.__setattr__(self, "stub_timestamps", stub_timestamps)
 
     @staticmethod
     def from_settings(raw: dict) -> "HyperliquidIngestConfig":
-        ingest = raw.get("ingest", {})
-        hyperliquid = ingest.get("hyperliquid", {})
-        rate_limit = hyperliquid.get("rate_limit", {})
-        retry = hyperliquid.get("retry", {})
+        # Only the ``ingest`` section and the target wallet feed the config, so a canonical
+        # dump of those is a safe memo key; the result is shared between callers, so its
+        # containers are read-only. No ``default=``: a value JSON cannot represent exactly
+        # could make two different configs share one key.
+        try:
+            ingest_key = json.dumps(raw.get("ingest", {}), sort_keys=True)
+        except TypeError as exc:
+            raise ValueError(f"ingest config must contain only JSON values: {exc}") from exc
         target_wallet = os.getenv("HYPERLIQUID_TARGET_WALLET", "")
-        enabled = bool(hyperliquid.get("enabled", False))
-        mode = str(hyperliquid.get("mode", "stub"))
-        if enabled and mode == "live" and not target_wallet:
-            raise ValueError("HYPERLIQUID_TARGET_WALLET required for live mode")
-        stub_events = [
-            RawPositionEvent(
-                symbol=str(item["symbol"]),
-                tx_hash=str(item["tx_hash"]),
-                event_index=int(item["event_index"]),
-                prev_target_net_position=float(item["prev_target_net_position"]),
-                next_target_net_position=float(item["next_target_net_position"]),
-                is_replay=int(item.get("is_replay", 0)),
-                timestamp_ms=(int(item["timestamp_ms"]) if "timestamp_ms" in item else None),
-                open_component=(
-                    float(item["open_component"])
-                    if "open_component" in item
-                    else None
-                ),
-                close_component=(
-                    float(item["close_component"])
-                    if "close_component" in item
-                    else None
-                ),
-                expected_price=(
-                    float(item["expected_price"])
-                    if "expected_price" in item
-                    else None
-                ),
-                expected_price_timestamp_ms=(
-                    int(item["expected_price_timestamp_ms"])
-                    if "expected_price_timestamp_ms" in item
-                    else None
-                ),
-            )
-            for item in hyperliquid.get("stub_events", [])
-        ]
-        return HyperliquidIngestConfig(
-            enabled=enabled,
-            mode=mode,
-            target_wallet=target_wallet,
-            rest_url=str(hyperliquid.get("rest_url", "https://api.hyperliquid.xyz/info")),
-            ws_url=str(hyperliquid.get("ws_url", "")),
-            request_timeout_ms=int(hyperliquid.get("request_timeout_ms", 10_000)),
-            backfill_window_ms=int(ingest.get("backfill_window_ms", 0)),
-            cursor_overlap_ms=int(ingest.get("cursor_overlap_ms", 0)),
-            symbol_map={str(k): str(v) for k, v in hyperliquid.get("symbol_map", {}).items()},
-            rate_limit=RateLimitPolicy(
-                max_requests=int(rate_limit.get("max_requests", 0)),
-                per_seconds=int(rate_limit.get("per_seconds", 1)),
-                cooldown_seconds=int(rate_limit.get("cooldown_seconds", 0)),
-            ),
-            retry=RetryPolicy(
-                max_attempts=int(retry.get("max_attempts", 0)),
-                base_delay_ms=int(retry.get("base_delay_ms", 250)),
-                max_delay_ms=int(retry.get("max_delay_ms", 2_000)),
-                jitter_ms=int(retry.get("jitter_ms", 100)),
-            ),
-            stub_events=stub_events,
-        )
+        return _ingest_config_from_json(ingest_key, target_wallet)
+
+
+@lru_cache(maxsize=8)
+def _ingest_config_from_json(ingest_key: str, target_wallet: str) -> HyperliquidIngestConfig:
+    ingest = json.loads(ingest_key)
+    hyperliquid = ingest.get("hyperliquid", {})
+    rate_limit = hyperliquid.get("rate_limit", {})
+    retry = hyperliquid.get("retry", {})
+    enabled = bool(hyperliquid.get("enabled", False))
+    mode = str(hyperliquid.get("mode", "stub"))
+    if enabled and mode == "live" and not target_wallet:
+        raise ValueError("HYPERLIQUID_TARGET_WALLET required for live mode")
+    stub_events = tuple(_parse_stub_event(item) for item in hyperliquid.get("stub_events", []))
+    return HyperliquidIngestConfig(
+        enabled=enabled,
+        mode=mode,
+        target_wallet=target_wallet,
+        rest_url=str(hyperliquid.get("rest_url", "https://api.hyperliquid.xyz/info")),
+        ws_url=str(hyperliquid.get("ws_url", "")),
+        request_timeout_ms=int(hyperliquid.get("request_timeout_ms", 10_000)),
+        backfill_window_ms=int(ingest.get("backfill_window_ms", 0)),
+        cursor_overlap_ms=int(ingest.get("cursor_overlap_ms", 0)),
+        # Interned so every emitted event shares one string object per symbol.
+        symbol_map=MappingProxyType(
+            {
+                sys.intern(str(k)): sys.intern(str(v))
+                for k, v in hyperliquid.get("symbol_map", {}).items()
+            }
+        ),
+        rate_limit=RateLimitPolicy(
+            max_requests=int(rate_limit.get("max_requests", 0)),
+            per_seconds=int(rate_limit.get("per_seconds", 1)),
+            cooldown_seconds=int(rate_limit.get("cooldown_seconds", 0)),
+        ),
+        retry=RetryPolicy(
+            max_attempts=int(retry.get("max_attempts", 0)),
+            base_delay_ms=int(retry.get("base_delay_ms", 250)),
+            max_delay_ms=int(retry.get("max_delay_ms", 2_000)),
+            jitter_ms=int(retry.get("jitter_ms", 100)),
+        ),
+        stub_events=stub_events,
+    )
+
+
+def _proxy_for(url: SplitResult) -> Optional[SplitResult]:
+    if not url.hostname or url_request.proxy_bypass(url.hostname):
+        return None
+    proxy = url_request.getproxies().get(url.scheme)
+    if not proxy:
+        return None
+    if "://" not in proxy:
+        proxy = f"http://{proxy}"
+    return urlsplit(proxy)
+
+
+def _parse_stub_event(item: dict) -> RawPositionEvent:
+    get = item.get
+    timestamp_ms = get("timestamp_ms")
+    open_component = get("open_component")
+    close_component = get("close_component")
+    expected_price = get("expected_price")
+    expected_price_timestamp_ms = get("expected_price_timestamp_ms")
+    return RawPositionEvent(
+        symbol=str(item["symbol"]),
+        tx_hash=str(item["tx_hash"]),
+        event_index=int(item["event_index"]),
+        prev_target_net_position=float(item["prev_target_net_position"]),
+        next_target_net_position=float(item["next_target_net_position"]),
+        is_replay=int(get("is_replay", 0)),
+        timestamp_ms=int(timestamp_ms) if timestamp_ms is not None else None,
+        open_component=float(open_component) if open_component is not None else None,
+        close_component=float(close_component) if close_component is not None else None,
+        expected_price=float(expected_price) if expected_price is not None else None,
+        expected_price_timestamp_ms=(
+            int(expected_price_timestamp_ms) if expected_price_timestamp_ms is not None else None
+        ),
+    )
+
+
+def _index_stub_events(
+    events: Iterable[RawPositionEvent],
+) -> tuple[tuple[RawPositionEvent, ...], tuple[int, ...]]:
+    dated = sorted(
+        (event for event in events if event.timestamp_ms is not None),
+        key=lambda event: event.timestamp_ms,
+    )
+    undated = [event for event in events if event.timestamp_ms is None]
+    timestamps = tuple(int(event.timestamp_ms) for event in dated)
+    return (*dated, *undated), timestamps
 
 
 class HyperliquidIngestAdapter:
@@ -155,13 +252,43 @@ class HyperliquidIngestAdapter:
         self._config = config
         self._logger = logger or logging.getLogger("hyperliquid")
         self._rate_limiter = RateLimiter(config.rate_limit)
+        self._known_coins = frozenset(config.symbol_map)
+        self._ws_config_ok = bool(
+            config.mode == "live" and config.enabled and config.ws_url and config.target_wallet
+        )
+        # Kept alive across backfill pages so each POST reuses the TCP/TLS session.
+        self._http: Optional[http_client.HTTPConnection] = None
+        rest_url = urlsplit(config.rest_url)
+        self._rest_path = rest_url.path or "/"
+        if rest_url.query:
+            self._rest_path = f"{self._rest_path}?{rest_url.query}"
+        self._timeout_s = max(config.request_timeout_ms / 1000.0, 1.0)
+        self._max_attempts = max(config.retry.max_attempts, 1)
+        # At most one page request is in flight, so the connection is never shared.
+        self._prefetch_pool: Optional[ThreadPoolExecutor] = None
+        self._ws_module = None
+        # The subscribe frame only depends on the frozen config; encode it once for reconnects.
+        self._ws_subscription = _json_dumps(
+            {
+                "method": "subscribe",
+                "subscription": {
+                    "type": "userFills",
+                    "user": config.target_wallet,
+                    "aggregateByTime": False,
+                },
+            }
+        )
         self._ws_app = None
         self._ws_thread: Optional[threading.Thread] = None
+        # Single producer (WS thread) / single consumer (poll loop). deque.extend and
+        # deque.popleft are atomic under the GIL, so neither side takes a lock.
         self._ws_buffer: Deque[dict] = deque(maxlen=10_000)
-        self._ws_lock = threading.Lock()
+        # Set by the WS thread after buffering fills; lets polls skip an empty drain.
+        self._ws_pending = threading.Event()
         self._ws_enabled = False
-        self._last_ws_message_ms: Optional[int] = None
-        self._last_ws_reconnect_ms: Optional[int] = None
+        # Monotonic timestamps; only used for liveness and reconnect throttling.
+        self._last_ws_message_ns: Optional[int] = None
+        self._last_ws_reconnect_ns: Optional[int] = None
         if self._should_start_ws():
             self._start_ws()
 
@@ -190,7 +317,9 @@ class HyperliquidIngestAdapter:
         if self._config.mode == "stub":
             return self._filter_stub_events(since_ms=since_ms, until_ms=until_ms), True
         if self._config.mode == "live":
-            return self._fetch_backfill_live(since_ms=since_ms, until_ms=until_ms)
+            # Backfilled fills are replays by definition; flag them here so the
+            # coordinator does not have to copy every event to set is_replay.
+            return self._fetch_backfill_live(since_ms=since_ms, until_ms=until_ms, is_replay=1)
         raise NotImplementedError(f"Unsupported ingest mode: {self._config.mode}")
 
     def poll_live_events(self, *, since_ms: int) -> List[RawPositionEvent]:
@@ -220,164 +349,254 @@ class HyperliquidIngestAdapter:
     def _filter_stub_events(
         self, *, since_ms: int, until_ms: Optional[int]
     ) -> List[RawPositionEvent]:
-        now_ms = int(time.time() * 1000)
-        events: List[RawPositionEvent] = []
-        for event in self._config.stub_events:
-            timestamp_ms = (
-                event.timestamp_ms if event.timestamp_ms is not None else now_ms
-            )
-            if timestamp_ms < since_ms:
-                continue
-            if until_ms is not None and timestamp_ms > until_ms:
-                continue
-            events.append(replace(event, timestamp_ms=timestamp_ms))
+        stub_events = self._config.stub_events
+        timestamps = self._config.stub_timestamps
+        lo = bisect_left(timestamps, since_ms)
+        hi = len(timestamps) if until_ms is None else bisect_right(timestamps, until_ms)
+        events = list(stub_events[lo:hi])
+        undated = stub_events[len(timestamps):]
+        if undated:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms >= since_ms and (until_ms is None or now_ms <= until_ms):
+                events.extend(replace(event, timestamp_ms=now_ms) for event in undated)
         return events
 
     def _fetch_backfill_live(
-        self, *, since_ms: int, until_ms: int
+        self, *, since_ms: int, until_ms: int, is_replay: int = 0
     ) -> tuple[List[RawPositionEvent], bool]:
         if not self._config.target_wallet:
             self._logger.warning("ingest_missing_target_wallet")
             return [], False
         events: List[RawPositionEvent] = []
         success = False
-        end_time = until_ms
-        while end_time >= since_ms:
-            payload = {
-                "type": "userFillsByTime",
-                "user": self._config.target_wallet,
-                "startTime": since_ms,
-                "endTime": end_time,
-                "aggregateByTime": False,
-            }
-            fills, ok = self._post_json(payload)
+        if until_ms < since_ms:
+            return events, success
+        payload = {
+            "type": "userFillsByTime",
+            "user": self._config.target_wallet,
+            "startTime": since_ms,
+            "endTime": until_ms,
+            "aggregateByTime": False,
+        }
+        fills, ok = self._post_json(payload)
+        while True:
             if ok:
                 success = True
             if not fills:
                 break
-            batch = self._fills_to_events(fills)
-            events.extend(batch)
+            # The next page only needs this page's oldest fill time, so request it
+            # before parsing and let the round-trip overlap the fill aggregation.
             oldest = self._oldest_fill_time(fills)
-            if oldest is None or oldest <= since_ms:
+            next_page: Optional[Future] = None
+            if oldest is not None and oldest > since_ms:
+                payload["endTime"] = oldest - 1
+                next_page = self._backfill_executor().submit(self._post_json, payload)
+            try:
+                events.extend(self._iter_fills_to_events(fills, is_replay=is_replay))
+            except BaseException:
+                # Never leave the prefetch running: it shares self._http with the caller.
+                if next_page is not None and not next_page.cancel():
+                    next_page.exception()
+                raise
+            if next_page is None:
                 break
-            end_time = oldest - 1
+            fills, ok = next_page.result()
         return events, success
 
+    def _backfill_executor(self) -> ThreadPoolExecutor:
+        if self._prefetch_pool is None:
+            self._prefetch_pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="hyperliquid-backfill"
+            )
+        return self._prefetch_pool
+
     def _poll_live_rest(self, *, since_ms: int) -> tuple[List[RawPositionEvent], bool]:
         if not self._config.target_wallet:
             self._logger.warning("ingest_missing_target_wallet")
             return [], False
-        now_ms = int(time.time() * 1000)
+        now_ms = time.time_ns() // 1_000_000
         return self._fetch_backfill_live(since_ms=since_ms, until_ms=now_ms)
 
     def _poll_live_ws(self, *, since_ms: int) -> List[RawPositionEvent]:
+        if not self._ws_pending.is_set():
+            return []
+        # Clear before draining so fills buffered mid-drain re-arm the flag.
+        self._ws_pending.clear()
         fills = self._drain_ws_fills()
         if not fills:
             return []
-        events = self._fills_to_events(fills)
-        return [event for event in events if (event.timestamp_ms or 0) >= since_ms]
+        return [
+            event
+            for event in self._iter_fills_to_events(fills)
+            if (event.timestamp_ms or 0) >= since_ms
+        ]
 
     def _post_json(self, payload: dict) -> tuple[List[dict], bool]:
-        body = json.dumps(payload).encode("utf-8")
-        req = url_request.Request(
-            self._config.rest_url,
-            data=body,
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
-        timeout = max(self._config.request_timeout_ms / 1000.0, 1.0)
+        body = _json_dumps(payload)
+        path = self._rest_path
+        retry = self._config.retry
         attempt = 0
+        delay_ms: Optional[int] = None
+        stale_retried = False
         while True:
             attempt += 1
+            reused = self._http is not None
+            resp = None
             try:
-                with url_request.urlopen(req, timeout=timeout) as resp:
-                    data = resp.read().decode("utf-8")
-                parsed = json.loads(data)
+                conn = self._http_connection()
+                conn.request(
+                    "POST", path, body=body, headers={"Content-Type": "application/json"}
+                )
+                resp = conn.getresponse()
+                data = resp.read()
+                if resp.status >= 400:
+                    raise http_client.HTTPException(f"HTTP Error {resp.status}: {resp.reason}")
+                parsed = _json_loads(data)
                 if isinstance(parsed, list):
                     return parsed, True
                 self._logger.warning("ingest_unexpected_response", extra={"payload": payload})
                 return [], False
-            except (url_error.URLError, json.JSONDecodeError) as exc:
-                if attempt >= max(self._config.retry.max_attempts, 1):
+            except (OSError, http_client.HTTPException, json.JSONDecodeError) as exc:
+                # The connection state is unknown after a failure; reconnect on retry.
+                self._close_http()
+                if (
+                    reused
+                    and resp is None
+                    and not stale_retried
+                    and isinstance(exc, (ConnectionResetError, BrokenPipeError))
+                ):
+                    # The server closed an idle keep-alive connection; this is not a
+                    # failed attempt, so reconnect and resend right away.
+                    stale_retried = True
+                    attempt -= 1
+                    continue
+                if attempt >= self._max_attempts:
                     self._logger.error(
                         "ingest_rest_failed",
                         extra={"error": str(exc), "attempts": attempt},
                     )
                     return [], False
-                delay_ms = self._config.retry.next_delay_ms(attempt)
+                delay_ms = retry.next_delay_ms(attempt, delay_ms)
                 time.sleep(delay_ms / 1000.0)
 
+    def _http_connection(self) -> http_client.HTTPConnection:
+        if self._http is None:
+            url = urlsplit(self._config.rest_url)
+            if url.scheme == "http":
+                conn_cls = http_client.HTTPConnection
+            else:
+                conn_cls = http_client.HTTPSConnection
+            proxy = _proxy_for(url)
+            if proxy is None:
+                self._http = conn_cls(url.netloc, timeout=self._timeout_s)
+            else:
+                # Honour HTTP(S)_PROXY/NO_PROXY like urlopen did: CONNECT through the
+                # proxy, then talk to the API host (TLS included) over the tunnel.
+                self._http = conn_cls(proxy.hostname, port=proxy.port, timeout=self._timeout_s)
+                headers = {}
+                if proxy.username is not None:
+                    credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+                    token = base64.b64encode(credentials.encode()).decode("ascii")
+                    headers["Proxy-Authorization"] = f"Basic {token}"
+                self._http.set_tunnel(url.hostname, url.port, headers=headers)
+        return self._http
+
+    def _close_http(self) -> None:
+        if self._http is None:
+            return
+        try:
+            self._http.close()
+        finally:
+            self._http = None
+
     def _fills_to_events(self, fills: Iterable[dict]) -> List[RawPositionEvent]:
+        return list(self._iter_fills_to_events(fills))
+
+    def _iter_fills_to_events(
+        self, fills: Iterable[dict], *, is_replay: int = 0
+    ) -> Iterator[RawPositionEvent]:
+        known_coins = self._known_coins
+        warning = self._logger.warning
         grouped: dict[tuple[str, str], list[dict]] = {}
+        grouped_setdefault = grouped.setdefault
+        # Groups normally arrive in (time, tid) order; only re-sort the ones that do not.
+        last_sort_keys: dict[tuple[str, str], tuple[int, int]] = {}
+        unsorted: set[tuple[str, str]] = set()
         missing_hash_count = 0
         for fill in fills:
-            coin = str(fill.get("coin", ""))
-            if coin.startswith("@") or coin not in self._config.symbol_map:
-                self._logger.warning(
+            fill_get = fill.get
+            coin = str(fill_get("coin", ""))
+            if coin[:1] == "@" or coin not in known_coins:
+                warning(
                     "ingest_unmapped_symbol",
                     extra={"coin": coin},
                 )
                 continue
-            hash_value = fill.get("hash")
+            hash_value = fill_get("hash")
             if not hash_value:
                 missing_hash_count += 1
-            tx_hash = str(hash_value or f"tid-{fill.get('tid', '')}")
+            tx_hash = str(hash_value or f"tid-{fill_get('tid', '')}")
             key = (tx_hash, coin)
-            grouped.setdefault(key, []).append(fill)
+            grouped_setdefault(key, []).append(fill)
+            sort_key = (_as_int(fill_get("time", 0)), _as_int(fill_get("tid", 0)))
+            last_sort_key = last_sort_keys.get(key)
+            if last_sort_key is not None and sort_key < last_sort_key:
+                unsorted.add(key)
+            last_sort_keys[key] = sort_key
 
         if missing_hash_count:
-            self._logger.warning(
+            warning(
                 "ingest_fill_missing_hash",
                 extra={"missing_hash_count": missing_hash_count},
             )
 
-        events: List[RawPositionEvent] = []
-        for (tx_hash, coin), group in grouped.items():
-            group_sorted = sorted(
-                group,
-                key=lambda item: (
-                    int(item.get("time", 0)),
-                    int(item.get("tid", 0)),
-                ),
-            )
-            event = self._aggregate_fills_to_raw(
-                group_sorted,
-                tx_hash=tx_hash,
-                coin=coin,
-            )
+        aggregate = self._aggregate_fills_to_raw
+        for key, group in grouped.items():
+            if key in unsorted:
+                group = sorted(group, key=_fill_sort_key)
+            event = aggregate(group, tx_hash=key[0], coin=key[1], is_replay=is_replay)
             if event is not None:
-                events.append(event)
-        return events
+                yield event
 
     def _aggregate_fills_to_raw(
-        self, fills: list[dict], *, tx_hash: str, coin: str
+        self, fills: list[dict], *, tx_hash: str, coin: str, is_replay: int = 0
     ) -> Optional[RawPositionEvent]:
         if not fills:
             return None
         symbol = self._config.symbol_map[coin]
+        warning = self._logger.warning
 
-        start_pos = 0.0
-        for fill in fills:
-            if fill.get("startPosition") is not None:
-                start_pos = float(fill.get("startPosition", 0.0))
-                break
-
+        # Single pass: the first startPosition seeds the derived position, while the
+        # last fill carrying startPosition (with a valid side and size) gives next_pos.
+        start_pos: Optional[float] = None
         total_delta = 0.0
-        sides: set[str] = set()
+        has_buy = False
+        has_sell = False
         valid_side_count = 0
+        last_start: Optional[float] = None
+        last_delta: Optional[float] = None
         for fill in fills:
-            side = str(fill.get("side", "")).upper()
-            if side not in {"B", "A"}:
-                self._logger.warning(
+            fill_get = fill.get
+            raw_start = fill_get("startPosition")
+            if start_pos is None and raw_start is not None:
+                start_pos = _as_float(raw_start)
+            side = fill_get("side", "")
+            if side != "B" and side != "A":
+                side = str(side).upper()
+            if side == "B":
+                has_buy = True
+            elif side == "A":
+                has_sell = True
+            else:
+                warning(
                     "ingest_fill_missing_side",
                     extra={"tx_hash": tx_hash, "coin": coin, "side": side},
                 )
                 continue
-            sides.add(side)
             try:
-                size = float(fill.get("sz", 0.0))
+                size = _as_float(fill_get("sz", 0.0))
             except (TypeError, ValueError):
-                self._logger.warning(
+                warning(
                     "ingest_fill_invalid_size",
                     extra={"tx_hash": tx_hash, "coin": coin},
                 )
@@ -385,29 +604,18 @@ class HyperliquidIngestAdapter:
             delta = size if side == "B" else -size
             total_delta += delta
             valid_side_count += 1
+            if raw_start is not None:
+                last_start = _as_float(raw_start)
+                last_delta = delta
 
         if valid_side_count == 0:
-            self._logger.warning(
+            warning(
                 "ingest_fill_no_valid_sides",
                 extra={"tx_hash": tx_hash, "coin": coin},
             )
             return None
-
-        last_start: Optional[float] = None
-        last_delta: Optional[float] = None
-        for fill in reversed(fills):
-            if fill.get("startPosition") is None:
-                continue
-            side = str(fill.get("side", "")).upper()
-            if side not in {"B", "A"}:
-                continue
-            try:
-                size = float(fill.get("sz", 0.0))
-            except (TypeError, ValueError):
-                continue
-            last_start = float(fill.get("startPosition", 0.0))
-            last_delta = size if side == "B" else -size
-            break
+        if start_pos is None:
+            start_pos = 0.0
 
         derived_next = start_pos + total_delta
         if last_start is not None and last_delta is not None:
@@ -415,14 +623,14 @@ class HyperliquidIngestAdapter:
         else:
             next_pos = derived_next
 
-        if len(sides) > 1:
-            self._logger.warning(
+        if has_buy and has_sell:
+            warning(
                 "ingest_fill_mixed_side",
-                extra={"tx_hash": tx_hash, "coin": coin, "sides": sorted(sides)},
+                extra={"tx_hash": tx_hash, "coin": coin, "sides": ["A", "B"]},
             )
 
         if abs(derived_next - next_pos) > 1e-9:
-            self._logger.warning(
+            warning(
                 "ingest_fill_position_mismatch",
                 extra={
                     "tx_hash": tx_hash,
@@ -434,11 +642,12 @@ class HyperliquidIngestAdapter:
             )
 
         last = fills[-1]
-        event_index = int(last.get("tid", 0))
-        timestamp_ms = int(last.get("time", 0))
+        event_index = _as_int(last.get("tid", 0))
+        timestamp_ms = _as_int(last.get("time", 0))
         open_component = None
         close_component = None
-        if start_pos > 0 > next_pos or start_pos < 0 < next_pos:
+        # Opposite signs mean the position flipped through zero.
+        if start_pos * next_pos < 0:
             close_component = abs(start_pos)
             open_component = abs(next_pos)
         return RawPositionEvent(
@@ -447,69 +656,28 @@ class HyperliquidIngestAdapter:
             event_index=event_index,
             prev_target_net_position=start_pos,
             next_target_net_position=next_pos,
+            is_replay=is_replay,
             timestamp_ms=timestamp_ms,
             open_component=open_component,
             close_component=close_component,
         )
 
-    def _fill_to_raw(self, fill: dict) -> Optional[RawPositionEvent]:
-        try:
-            coin = str(fill["coin"])
-            if coin.startswith("@") or coin not in self._config.symbol_map:
-                self._logger.warning(
-                    "ingest_unmapped_symbol",
-                    extra={"coin": coin},
-                )
-                return None
-            symbol = self._config.symbol_map[coin]
-            start_pos = float(fill.get("startPosition", 0.0))
-            size = float(fill.get("sz", 0.0))
-            side = str(fill.get("side", "")).upper()
-            delta = size if side == "B" else -size
-            next_pos = start_pos + delta
-            tx_hash = str(fill.get("hash") or f"tid-{fill.get('tid', '')}")
-            event_index = int(fill.get("tid", 0))
-            timestamp_ms = int(fill.get("time", 0))
-            open_component = None
-            close_component = None
-            if start_pos > 0 > next_pos or start_pos < 0 < next_pos:
-                close_component = abs(start_pos)
-                open_component = abs(next_pos)
-            return RawPositionEvent(
-                symbol=symbol,
-                tx_hash=tx_hash,
-                event_index=event_index,
-                prev_target_net_position=start_pos,
-                next_target_net_position=next_pos,
-                timestamp_ms=timestamp_ms,
-                open_component=open_component,
-                close_component=close_component,
-            )
-        except (KeyError, ValueError, TypeError) as exc:
-            self._logger.warning("ingest_fill_parse_failed", extra={"error": str(exc)})
-            return None
-
     @staticmethod
     def _oldest_fill_time(fills: Iterable[dict]) -> Optional[int]:
-        times = [int(fill.get("time", 0)) for fill in fills if "time" in fill]
-        if not times:
-            return None
-        return min(times)
+        return min((_as_int(fill["time"]) for fill in fills if "time" in fill), default=None)
 
     def _should_start_ws(self) -> bool:
-        if self._config.mode != "live":
-            return False
-        if not self._config.enabled or not self._config.ws_url:
-            return False
-        if not self._config.target_wallet:
-            return False
-        if websocket is None:
-            self._logger.warning("ingest_ws_missing_dependency")
+        if not self._ws_config_ok:
             return False
+        if self._ws_module is None:
+            self._ws_module = _import_websocket()
+            if self._ws_module is None:
+                self._logger.warning("ingest_ws_missing_dependency")
+                return False
         return True
 
     def _start_ws(self) -> None:
-        self._ws_app = websocket.WebSocketApp(
+        self._ws_app = self._ws_module.WebSocketApp(
             self._config.ws_url,
             on_open=self._on_ws_open,
             on_message=self._on_ws_message,
@@ -524,52 +692,52 @@ class HyperliquidIngestAdapter:
         self._ws_thread.start()
 
     def _on_ws_open(self, _ws) -> None:
-        subscription = {
-            "method": "subscribe",
-            "subscription": {
-                "type": "userFills",
-                "user": self._config.target_wallet,
-                "aggregateByTime": False,
-            },
-        }
         try:
-            _ws.send(json.dumps(subscription))
+            _ws.send(self._ws_subscription)
             self._ws_enabled = True
-            self._last_ws_message_ms = int(time.time() * 1000)
+            self._last_ws_message_ns = time.monotonic_ns()
         except Exception as exc:
             self._logger.error("ingest_ws_subscribe_failed", extra={"error": str(exc)})
 
     def _on_ws_message(self, _ws, message: str) -> None:
+        now_ns = time.monotonic_ns()
+        # Pong and subscription acks never mention userFills; they only prove liveness,
+        # so skip decoding them entirely.
+        if ("userFills" if type(message) is str else b"userFills") not in message:
+            self._last_ws_message_ns = now_ns
+            return
         try:
-            payload = json.loads(message)
+            payload = _json_loads(message)
         except json.JSONDecodeError:
             self._logger.warning("ingest_ws_bad_json")
             return
-        self._last_ws_message_ms = int(time.time() * 1000)
-        if payload.get("isSnapshot") is True:
+        self._last_ws_message_ns = now_ns
+        if type(payload) is not dict:
             return
-        if payload.get("channel") != "userFills":
+        if payload.get("channel") != "userFills" or payload.get("isSnapshot") is True:
             return
         data = payload.get("data")
-        if isinstance(data, dict) and data.get("isSnapshot") is True:
-            return
-        fills: List[dict] = []
-        if isinstance(data, list):
+        if type(data) is list:
             fills = data
-        elif isinstance(data, dict):
-            if "fills" in data and isinstance(data["fills"], list):
-                fills = data["fills"]
-            elif "data" in data and isinstance(data["data"], list):
-                fills = data["data"]
+        elif type(data) is dict:
+            if data.get("isSnapshot") is True:
+                return
+            fills = data.get("fills")
+            if type(fills) is not list:
+                fills = data.get("data")
+                if type(fills) is not list:
+                    return
+        else:
+            return
         if not fills:
             return
-        with self._ws_lock:
-            before = len(self._ws_buffer)
-            self._ws_buffer.extend(fills)
-            after = len(self._ws_buffer)
-            if after < before + len(fills):
-                self._logger.warning("ingest_ws_buffer_dropped")
-        self._last_ws_message_ms = int(time.time() * 1000)
+        buffer = self._ws_buffer
+        before = len(buffer)
+        buffer.extend(fills)
+        # Best-effort without a lock: a drain racing this check can trigger a spurious warning.
+        if len(buffer) < before + len(fills):
+            self._logger.warning("ingest_ws_buffer_dropped")
+        self._ws_pending.set()
 
     def _on_ws_error(self, _ws, error) -> None:
         self._logger.warning("ingest_ws_error", extra={"error": str(error)})
@@ -588,28 +756,33 @@ class HyperliquidIngestAdapter:
         self._schedule_ws_reconnect()
 
     def _drain_ws_fills(self) -> List[dict]:
-        with self._ws_lock:
-            if not self._ws_buffer:
-                return []
-            fills = list(self._ws_buffer)
-            self._ws_buffer.clear()
-            return fills
+        buffer = self._ws_buffer
+        popleft = buffer.popleft
+        # Only take what was buffered on entry; later frames stay for the next poll.
+        return [popleft() for _ in range(len(buffer))]
 
     def _ws_recent(self) -> bool:
-        if self._last_ws_message_ms is None:
+        if self._last_ws_message_ns is None:
             return False
-        return int(time.time() * 1000) - self._last_ws_message_ms <= 30_000
+        return time.monotonic_ns() - self._last_ws_message_ns <= 30_000_000_000
 
     def _schedule_ws_reconnect(self) -> None:
         if not self._should_start_ws():
             return
-        now_ms = int(time.time() * 1000)
-        if self._last_ws_reconnect_ms and now_ms - self._last_ws_reconnect_ms < 5_000:
+        now_ns = time.monotonic_ns()
+        if (
+            self._last_ws_reconnect_ns is not None
+            and now_ns - self._last_ws_reconnect_ns < 5_000_000_000
+        ):
             return
-        self._last_ws_reconnect_ms = now_ms
+        self._last_ws_reconnect_ns = now_ns
         threading.Thread(target=self._start_ws, daemon=True).start()
 
     def close(self) -> None:
+        if self._prefetch_pool is not None:
+            self._prefetch_pool.shutdown(wait=True)
+            self._prefetch_pool = None
+        self._close_http()
         if self._ws_app is not None:
             try:
                 self._ws_app.close()
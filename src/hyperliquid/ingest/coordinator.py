@@ -2,22 +2,45 @@ from __future__ import annotations
 
 import logging
 import time
-from dataclasses import dataclass, replace
+from dataclasses import dataclass, fields
+from operator import attrgetter
 from typing import Callable, List, Optional
 
-from hyperliquid.common.models import PositionDeltaEvent, assert_contract_version
+from hyperliquid.common.models import PositionDeltaEvent
 from hyperliquid.common.settings import Settings
 from hyperliquid.ingest.adapters.hyperliquid import (
     HyperliquidIngestAdapter,
     HyperliquidIngestConfig,
 )
 from hyperliquid.ingest.service import IngestService, RawPositionEvent
-from hyperliquid.storage.db import get_system_state, set_system_state, update_cursor
+from hyperliquid.storage.db import (
+    get_system_state,
+    get_system_state_many,
+    set_system_state,
+    update_cursor,
+)
 from hyperliquid.storage.persistence import AuditLogEntry, DbPersistence
 from hyperliquid.storage.safety import set_safety_state
 
 
-@dataclass(frozen=True)
+# Positional field order of RawPositionEvent, read once so replay-flag copies skip the
+# per-call reflection in dataclasses.replace.
+_RAW_EVENT_FIELDS = tuple(field.name for field in fields(RawPositionEvent))
+_RAW_EVENT_VALUES = attrgetter(*_RAW_EVENT_FIELDS)
+_IS_REPLAY_INDEX = _RAW_EVENT_FIELDS.index("is_replay")
+
+# Everything run_once needs from system_state before ingesting, read in one query.
+_RUN_STATE_KEYS = (
+    "safety_mode",
+    "safety_reason_code",
+    "last_processed_timestamp_ms",
+    "last_ingest_success_ms",
+)
+
+_MAINTENANCE_STATE_KEYS = ("safety_mode", "safety_reason_code", "maintenance_skip_applied_ms")
+
+
+@dataclass(frozen=True, slots=True)
 class IngestRuntimeConfig:
     backfill_window_ms: int
     cursor_overlap_ms: int
@@ -62,44 +85,49 @@ class IngestCoordinator:
         )
 
     def run_once(self, conn, *, mode: str) -> List[PositionDeltaEvent]:
-        safety_mode = get_system_state(conn, "safety_mode") or "ARMED_SAFE"
+        state = get_system_state_many(conn, _RUN_STATE_KEYS)
+        # One clock read per tick, shared by the gap checks and success bookkeeping.
+        now_ms = int(time.time() * 1000)
+        safety_mode = state.get("safety_mode") or "ARMED_SAFE"
         if safety_mode == "HALT":
-            reason_code = get_system_state(conn, "safety_reason_code") or ""
+            reason_code = state.get("safety_reason_code") or ""
             if self.runtime.maintenance_skip_gap and reason_code == "BACKFILL_WINDOW_EXCEEDED":
-                now_ms = int(time.time() * 1000)
                 self._apply_maintenance_skip(conn, now_ms=now_ms)
                 return []
             else:
                 return []
         if mode == "backfill-only":
-            events, should_poll_live = self._run_backfill(conn)
+            events, should_poll_live = self._run_backfill(conn, state, now_ms=now_ms)
         else:
-            backfill_events, should_poll_live = self._run_backfill(conn)
-            live_events = self._run_live_poll(conn) if should_poll_live else []
+            backfill_events, should_poll_live = self._run_backfill(conn, state, now_ms=now_ms)
+            live_events = self._run_live_poll(conn, now_ms=now_ms) if should_poll_live else []
             events = [*backfill_events, *live_events]
-        for event in events:
-            assert_contract_version(event.contract_version)
+        # Each successful poll writes last_ingest_success_ms without committing; this
+        # commits it together with the rest of the tick's writes.
+        conn.commit()
         return events
 
     def apply_maintenance_skip(self, conn) -> bool:
-        safety_mode = get_system_state(conn, "safety_mode") or "ARMED_SAFE"
-        reason_code = get_system_state(conn, "safety_reason_code") or ""
+        state = get_system_state_many(conn, _MAINTENANCE_STATE_KEYS)
+        safety_mode = state.get("safety_mode") or "ARMED_SAFE"
+        reason_code = state.get("safety_reason_code") or ""
         if safety_mode != "HALT":
             return False
         if reason_code != "BACKFILL_WINDOW_EXCEEDED":
             return False
         if not self.runtime.maintenance_skip_gap:
             return False
-        if get_system_state(conn, "maintenance_skip_applied_ms") is not None:
+        if "maintenance_skip_applied_ms" in state:
             return False
         now_ms = int(time.time() * 1000)
         self._apply_maintenance_skip(conn, now_ms=now_ms)
         return True
 
-    def _run_backfill(self, conn) -> tuple[List[PositionDeltaEvent], bool]:
-        last_ts = int(get_system_state(conn, "last_processed_timestamp_ms") or 0)
-        last_success_ms = int(get_system_state(conn, "last_ingest_success_ms") or 0)
-        now_ms = int(time.time() * 1000)
+    def _run_backfill(
+        self, conn, state: dict[str, str], *, now_ms: int
+    ) -> tuple[List[PositionDeltaEvent], bool]:
+        last_ts = int(state.get("last_processed_timestamp_ms") or 0)
+        last_success_ms = int(state.get("last_ingest_success_ms") or 0)
         if last_success_ms == 0 and last_ts > 0:
             # Legacy DBs before bootstrap seed; preserve upgrade safety semantics.
             last_success_ms = last_ts
@@ -128,22 +156,24 @@ class IngestCoordinator:
             since_ms=since_ms, until_ms=now_ms
         )
         if success:
-            set_system_state(conn, "last_ingest_success_ms", str(int(time.time() * 1000)))
+            set_system_state(conn, "last_ingest_success_ms", str(now_ms), commit=False)
         replay_events = [self._with_replay_flag(event, 1) for event in raw_events]
         return self.ingest_service.ingest_raw_events(replay_events, conn), True
 
-    def _run_live_poll(self, conn) -> List[PositionDeltaEvent]:
+    def _run_live_poll(self, conn, *, now_ms: int) -> List[PositionDeltaEvent]:
         last_ts = int(get_system_state(conn, "last_processed_timestamp_ms") or 0)
         raw_events, success = self.adapter.poll_live_events_with_status(since_ms=last_ts)
         if success:
-            set_system_state(conn, "last_ingest_success_ms", str(int(time.time() * 1000)))
+            set_system_state(conn, "last_ingest_success_ms", str(now_ms), commit=False)
         live_events = [self._with_replay_flag(event, 0) for event in raw_events]
         return self.ingest_service.ingest_raw_events(live_events, conn)
 
     def _with_replay_flag(self, event: RawPositionEvent, is_replay: int) -> RawPositionEvent:
         if event.is_replay == is_replay:
             return event
-        return replace(event, is_replay=is_replay)
+        values = list(_RAW_EVENT_VALUES(event))
+        values[_IS_REPLAY_INDEX] = is_replay
+        return RawPositionEvent(*values)
 
     def _halt_for_gap(
         self, conn, *, last_success_ms: int, last_event_ts: int, now_ms: int
@@ -8,12 +8,20 @@ from typing import Iterable, List, Optional
 from hyperliquid.common.models import PositionDeltaEvent, assert_contract_version
 from hyperliquid.storage.db import (
     advance_cursor_if_newer,
-    has_processed_tx,
-    record_processed_tx,
+    processed_tx_keys,
+    record_processed_txs,
+)
+
+# action_type keyed by 3 * (sign(prev) + 1) + (sign(next) + 1). A flat prev is handled
+# by the delta rule, and None marks same-sign moves that need a magnitude compare.
+_ACTION_BY_SIGNS = (
+    None, "DECREASE", "FLIP",
+    None, None, None,
+    "FLIP", "DECREASE", None,
 )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RawPositionEvent:
     symbol: str
     tx_hash: str
@@ -47,21 +55,20 @@ class IngestService:
         expected_price_timestamp_ms: Optional[int] = None,
     ) -> PositionDeltaEvent:
         if timestamp_ms is None:
-            timestamp_ms = int(time.time() * 1000)
+            timestamp_ms = time.time_ns() // 1_000_000
         if expected_price is not None and expected_price_timestamp_ms is None:
             expected_price_timestamp_ms = timestamp_ms
         delta = next_target_net_position - prev_target_net_position
         if action_type is None:
-            if prev_target_net_position == 0:
+            prev, nxt = prev_target_net_position, next_target_net_position
+            if prev == 0:
                 action_type = "INCREASE" if delta != 0 else "DECREASE"
-            elif prev_target_net_position > 0 > next_target_net_position:
-                action_type = "FLIP"
-            elif prev_target_net_position < 0 < next_target_net_position:
-                action_type = "FLIP"
-            elif abs(next_target_net_position) < abs(prev_target_net_position):
-                action_type = "DECREASE"
             else:
-                action_type = "INCREASE"
+                action_type = _ACTION_BY_SIGNS[
+                    3 * ((prev > 0) - (prev < 0)) + (nxt > 0) - (nxt < 0) + 4
+                ]
+                if action_type is None:
+                    action_type = "DECREASE" if abs(nxt) < abs(prev) else "INCREASE"
 
         event = PositionDeltaEvent(
             symbol=symbol,
@@ -84,10 +91,22 @@ class IngestService:
     def ingest_raw_events(
         self, raw_events: Iterable[RawPositionEvent], conn: sqlite3.Connection
     ) -> List[PositionDeltaEvent]:
+        raw_events = list(raw_events)
+        if not raw_events:
+            return []
+        # One lookup for the whole batch; keys recorded below are added so in-batch
+        # duplicates are skipped exactly as a per-event check would.
+        seen = processed_tx_keys(
+            conn, [(raw.tx_hash, raw.event_index, raw.symbol) for raw in raw_events]
+        )
         events: List[PositionDeltaEvent] = []
+        # Undated events in a batch share one arrival time instead of reading the clock each.
+        now_ms = time.time_ns() // 1_000_000
         for raw in raw_events:
-            if has_processed_tx(conn, raw.tx_hash, raw.event_index, raw.symbol):
+            key = (raw.tx_hash, raw.event_index, raw.symbol)
+            if key in seen:
                 continue
+            seen.add(key)
             event = self.build_position_delta_event(
                 symbol=raw.symbol,
                 tx_hash=raw.tx_hash,
@@ -95,29 +114,42 @@ class IngestService:
                 prev_target_net_position=raw.prev_target_net_position,
                 next_target_net_position=raw.next_target_net_position,
                 is_replay=raw.is_replay,
-                timestamp_ms=raw.timestamp_ms,
+                timestamp_ms=raw.timestamp_ms if raw.timestamp_ms is not None else now_ms,
                 open_component=raw.open_component,
                 close_component=raw.close_component,
                 expected_price=raw.expected_price,
                 expected_price_timestamp_ms=raw.expected_price_timestamp_ms,
             )
-            with conn:
-                record_processed_tx(
-                    conn,
-                    tx_hash=event.tx_hash,
-                    event_index=event.event_index,
-                    symbol=event.symbol,
-                    timestamp_ms=event.timestamp_ms,
-                    is_replay=event.is_replay,
-                    commit=False,
-                )
-                advance_cursor_if_newer(
-                    conn,
-                    timestamp_ms=event.timestamp_ms,
-                    event_index=event.event_index,
-                    tx_hash=event.tx_hash,
-                    symbol=event.symbol,
-                    commit=False,
-                )
             events.append(event)
+        if not events:
+            return events
+        # One transaction per batch. The cursor only ever moves to the newest key, so
+        # advancing once to the batch maximum matches advancing after every event.
+        newest = max(
+            events,
+            key=lambda event: (event.timestamp_ms, event.event_index, event.tx_hash, event.symbol),
+        )
+        with conn:
+            record_processed_txs(
+                conn,
+                [
+                    (
+                        event.tx_hash,
+                        event.event_index,
+                        event.symbol,
+                        event.timestamp_ms,
+                        event.is_replay,
+                    )
+                    for event in events
+                ],
+                commit=False,
+            )
+            advance_cursor_if_newer(
+                conn,
+                timestamp_ms=newest.timestamp_ms,
+                event_index=newest.event_index,
+                tx_hash=newest.tx_hash,
+                symbol=newest.symbol,
+                commit=False,
+            )
         return events
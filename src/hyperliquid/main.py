@@ -3,13 +3,15 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
-from dotenv import load_dotenv
-
 from hyperliquid.common.settings import load_settings
-from hyperliquid.orchestrator.service import Orchestrator
 
+# Resolved against the checkout (src/hyperliquid/main.py -> repo root), not the CWD.
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+_SCHEMA_PATH = _REPO_ROOT / "config" / "schema.json"
+_DOTENV_PATH = _REPO_ROOT / ".env"
 
-def parse_args() -> argparse.Namespace:
+
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Hyperliquid copy trader")
     parser.add_argument(
         "--mode",
@@ -39,7 +41,20 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Idle sleep interval in seconds for continuous run loop (overrides config)",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--no-validate-config",
+        action="store_true",
+        help="Skip JSON schema validation of --config (only for configs already "
+        "validated with tools/validate_config.py against the current schema)",
+    )
+    return parser
+
+
+_PARSER = _build_parser()
+
+
+def parse_args() -> argparse.Namespace:
+    args = _PARSER.parse_args()
     if args.loop_interval_sec is not None and args.loop_interval_sec < 1:
         raise SystemExit("--loop-interval-sec must be >= 1")
     return args
@@ -47,11 +62,18 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> int:
     args = parse_args()
+    # Deferred so --help and argument errors don't import the full pipeline.
+    from hyperliquid.orchestrator.service import Orchestrator
+
     config_path = Path(args.config)
-    schema_path = Path("config/schema.json")
 
-    load_dotenv()
-    settings = load_settings(config_path, schema_path)
+    # Bare load_dotenv() walked up from this file to the repo root; stat that one
+    # path instead and skip importing dotenv when there is no .env.
+    if _DOTENV_PATH.is_file():
+        from dotenv import load_dotenv
+
+        load_dotenv(_DOTENV_PATH, override=False)
+    settings = load_settings(config_path, _SCHEMA_PATH, validate=not args.no_validate_config)
     orchestrator = Orchestrator(
         settings=settings,
         mode=args.mode,
@@ -3,7 +3,7 @@ from __future__ import annotations
 import signal
 import time
 from typing import List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from hyperliquid.common.logging import setup_logging
 from hyperliquid.common.metrics import MetricsEmitter
@@ -29,12 +29,78 @@ from hyperliquid.ingest.coordinator import IngestCoordinator
 from hyperliquid.ingest.service import IngestService, RawPositionEvent
 from hyperliquid.safety.reconcile import PositionSnapshot, ReconciliationResult
 from hyperliquid.safety.service import SafetyService
-from hyperliquid.storage.db import assert_schema_version, get_system_state, init_db, set_system_state
+from hyperliquid.storage.db import (
+    apply_runtime_pragmas,
+    assert_schema_version,
+    get_system_state,
+    get_system_state_many,
+    init_db,
+    set_system_state,
+    set_system_state_many,
+    set_system_states_if_missing,
+)
 from hyperliquid.storage.positions import load_local_positions
 from hyperliquid.storage.safety import load_safety_state, set_safety_state
 from hyperliquid.storage.persistence import DbPersistence
 
 
+_BOOTSTRAP_STATE_KEYS = (
+    "last_processed_timestamp_ms",
+    "last_ingest_success_ms",
+    "last_processed_event_key",
+    "safety_mode",
+    "safety_reason_code",
+    "safety_reason_message",
+    "safety_changed_at_ms",
+)
+
+_HALT_AUTO_RECOVERY_REASONS = frozenset(
+    {"SNAPSHOT_STALE", "BACKFILL_WINDOW_EXCEEDED", "RECONCILE_CRITICAL"}
+)
+_ADAPTER_HEALTH_KEYS = ("adapter_last_success_ms", "adapter_last_error_ms")
+
+
+class _SleepInterrupted(BaseException):
+    # Raised by the loop's signal handler only while it is inside _sleep.
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class _ReconcileThresholds:
+    warn_threshold: float
+    critical_threshold: float
+    snapshot_max_stale_ms: int
+
+    @staticmethod
+    def from_settings(raw: dict) -> "_ReconcileThresholds":
+        safety = raw.get("safety", {})
+        return _ReconcileThresholds(
+            warn_threshold=float(safety.get("warn_threshold", 0.0)),
+            critical_threshold=float(safety.get("critical_threshold", 0.0)),
+            snapshot_max_stale_ms=int(safety.get("snapshot_max_stale_ms", 0)),
+        )
+
+
+class _AdapterMethod:
+    # Resolves an optional adapter method once per adapter instance; the execution
+    # adapter can be swapped after services are built (tests, reconnects).
+    __slots__ = ("_execution", "_name", "_adapter", "_method")
+
+    def __init__(self, execution: ExecutionService, name: str) -> None:
+        self._execution = execution
+        self._name = name
+        self._adapter: object = None
+        self._method = None
+
+    def resolve(self):
+        adapter = self._execution.adapter
+        if adapter is not self._adapter:
+            method = getattr(adapter, self._name, None) if adapter is not None else None
+            self._adapter = adapter
+            self._method = method if callable(method) else None
+        return self._method
+
+
 @dataclass
 class Orchestrator:
     settings: Settings
@@ -42,6 +108,10 @@ class Orchestrator:
     emit_boot_event: bool = True
     run_loop: bool = False
     loop_interval_sec: Optional[int] = None
+    _reconcile_thresholds: _ReconcileThresholds = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._reconcile_thresholds = _ReconcileThresholds.from_settings(self.settings.raw)
 
     def run(self) -> None:
         logger = setup_logging(self.settings.app_log_path, self.settings.log_level)
@@ -51,6 +121,7 @@ class Orchestrator:
         try:
             logger.info("boot_start")
             conn = init_db(self.settings.db_path)
+            apply_runtime_pragmas(conn)
             audit_recorder = DbPersistence(conn).record_audit
             assert_schema_version(conn)
 
@@ -103,12 +174,14 @@ class Orchestrator:
     def _handle_config_hash(
         conn, config_hash: str, logger, *, audit_recorder=None
     ) -> None:
-        existing = get_system_state(conn, "config_hash")
+        state = get_system_state_many(conn, ("config_hash", "safety_mode"))
+        existing = state.get("config_hash")
         if existing and existing != config_hash:
             logger.warning("config_hash_changed", extra={"previous": existing})
-            if get_system_state(conn, "safety_mode") == "HALT":
+            safety_mode = state.get("safety_mode")
+            if safety_mode == "HALT":
                 return
-            mode = get_system_state(conn, "safety_mode") or "ARMED_SAFE"
+            mode = safety_mode or "ARMED_SAFE"
             set_safety_state(
                 conn,
                 mode=mode,
@@ -118,8 +191,10 @@ class Orchestrator:
             )
 
     def _record_config(self, conn, config_hash: str, *, audit_recorder=None) -> None:
-        set_system_state(conn, "config_hash", config_hash)
-        set_system_state(conn, "config_version", self.settings.config_version)
+        set_system_state_many(
+            conn,
+            (("config_hash", config_hash), ("config_version", self.settings.config_version)),
+        )
         self._assert_contract_version(conn, audit_recorder=audit_recorder)
         set_system_state(conn, "contract_version", CONTRACT_VERSION)
 
@@ -142,23 +217,24 @@ class Orchestrator:
     @staticmethod
     def _ensure_bootstrap_state(conn) -> None:
         now_ms = int(time.time() * 1000)
-        if get_system_state(conn, "last_processed_timestamp_ms") is None:
-            set_system_state(conn, "last_processed_timestamp_ms", "0")
-        last_ingest_success = get_system_state(conn, "last_ingest_success_ms")
-        if last_ingest_success is None or str(last_ingest_success) == "0":
-            last_processed = int(get_system_state(conn, "last_processed_timestamp_ms") or 0)
-            seed_ms = last_processed if last_processed > 0 else now_ms
-            set_system_state(conn, "last_ingest_success_ms", str(seed_ms))
-        if get_system_state(conn, "last_processed_event_key") is None:
-            set_system_state(conn, "last_processed_event_key", "")
-        if get_system_state(conn, "safety_mode") is None:
-            set_system_state(conn, "safety_mode", "ARMED_SAFE")
-        if get_system_state(conn, "safety_reason_code") is None:
-            set_system_state(conn, "safety_reason_code", "BOOTSTRAP")
-        if get_system_state(conn, "safety_reason_message") is None:
-            set_system_state(conn, "safety_reason_message", "Initial bootstrap state")
-        if get_system_state(conn, "safety_changed_at_ms") is None:
-            set_system_state(conn, "safety_changed_at_ms", str(now_ms))
+        state = get_system_state_many(conn, _BOOTSTRAP_STATE_KEYS)
+        defaults = [
+            ("last_processed_timestamp_ms", "0"),
+            ("last_processed_event_key", ""),
+            ("safety_mode", "ARMED_SAFE"),
+            ("safety_reason_code", "BOOTSTRAP"),
+            ("safety_reason_message", "Initial bootstrap state"),
+            ("safety_changed_at_ms", str(now_ms)),
+        ]
+        with conn:
+            set_system_states_if_missing(
+                conn, [pair for pair in defaults if pair[0] not in state], commit=False
+            )
+            last_ingest_success = state.get("last_ingest_success_ms")
+            if last_ingest_success is None or last_ingest_success == "0":
+                last_processed = int(state.get("last_processed_timestamp_ms") or 0)
+                seed_ms = last_processed if last_processed > 0 else now_ms
+                set_system_state(conn, "last_ingest_success_ms", str(seed_ms), commit=False)
 
     def _initialize_services(self, conn, logger, *, audit_recorder=None) -> dict[str, object]:
         def safety_mode_provider() -> str:
@@ -195,10 +271,12 @@ class Orchestrator:
         )
         decision_config = DecisionConfig.from_settings(self.settings.raw)
 
+        price_fetcher = _AdapterMethod(execution_service, "fetch_mark_price")
+        filters_fetcher = _AdapterMethod(execution_service, "fetch_symbol_filters")
+
         def price_provider(symbol: str) -> PriceSnapshot | None:
-            adapter = execution_service.adapter
-            fetcher = getattr(adapter, "fetch_mark_price", None)
-            if adapter is None or not callable(fetcher):
+            fetcher = price_fetcher.resolve()
+            if fetcher is None:
                 return None
             try:
                 price = float(fetcher(symbol))
@@ -207,9 +285,8 @@ class Orchestrator:
             return PriceSnapshot(price=price, timestamp_ms=int(time.time() * 1000), source="adapter")
 
         def filters_provider(symbol: str):
-            adapter = execution_service.adapter
-            fetcher = getattr(adapter, "fetch_symbol_filters", None)
-            if adapter is None or not callable(fetcher):
+            fetcher = filters_fetcher.resolve()
+            if fetcher is None:
                 return None
             try:
                 return fetcher(symbol)
@@ -299,7 +376,8 @@ class Orchestrator:
 
         try:
             exchange_positions, exchange_ts_ms = adapter.fetch_positions()
-            self._record_adapter_success(conn)
+            now_ms = int(time.time() * 1000)
+            self._record_adapter_success(conn, now_ms=now_ms)
         except AdapterNotImplementedError as exc:
             logger.info(
                 "reconcile_skipped",
@@ -332,7 +410,6 @@ class Orchestrator:
             )
             return None, None
 
-        now_ms = int(time.time() * 1000)
         local_positions = load_local_positions(conn)
         local_snapshot = PositionSnapshot(
             source="local",
@@ -345,37 +422,36 @@ class Orchestrator:
             timestamp_ms=exchange_ts_ms,
         )
 
-        safety_config = self.settings.raw.get("safety", {})
-        warn_threshold = float(safety_config.get("warn_threshold", 0.0))
-        critical_threshold = float(safety_config.get("critical_threshold", 0.0))
-        snapshot_max_stale_ms = int(safety_config.get("snapshot_max_stale_ms", 0))
+        thresholds = self._reconcile_thresholds
         current_state = load_safety_state(conn)
 
         raw_result = safety.reconcile_snapshots(
             local_snapshot=local_snapshot,
             exchange_snapshot=exchange_snapshot,
-            warn_threshold=warn_threshold,
-            critical_threshold=critical_threshold,
-            snapshot_max_stale_ms=snapshot_max_stale_ms,
+            warn_threshold=thresholds.warn_threshold,
+            critical_threshold=thresholds.critical_threshold,
+            snapshot_max_stale_ms=thresholds.snapshot_max_stale_ms,
             current_state=None,
             allow_auto_promote=allow_auto_promote,
         )
-        result = safety.reconcile_snapshots(
-            local_snapshot=local_snapshot,
-            exchange_snapshot=exchange_snapshot,
-            warn_threshold=warn_threshold,
-            critical_threshold=critical_threshold,
-            snapshot_max_stale_ms=snapshot_max_stale_ms,
-            current_state=current_state,
-            allow_auto_promote=allow_auto_promote,
-        )
-        set_safety_state(
-            conn,
-            mode=result.mode,
-            reason_code=result.reason_code,
-            reason_message=result.reason_message,
-            audit_recorder=audit_recorder,
+        # The stateful result only layers the mode policy over the raw drift result.
+        result = safety.apply_reconcile_policy(
+            raw_result, current_state, allow_auto_promote=allow_auto_promote
         )
+        # A healthy reconcile usually repeats the stored state; rewriting it would only
+        # bump safety_changed_at_ms.
+        if current_state is None or (
+            current_state.mode,
+            current_state.reason_code,
+            current_state.reason_message,
+        ) != (result.mode, result.reason_code, result.reason_message):
+            set_safety_state(
+                conn,
+                mode=result.mode,
+                reason_code=result.reason_code,
+                reason_message=result.reason_message,
+                audit_recorder=audit_recorder,
+            )
         logger.info(
             "reconcile_result",
             extra={
@@ -393,8 +469,10 @@ class Orchestrator:
         return result, raw_result
 
     @staticmethod
-    def _record_adapter_success(conn) -> None:
-        set_system_state(conn, "adapter_last_success_ms", str(int(time.time() * 1000)))
+    def _record_adapter_success(conn, *, now_ms: Optional[int] = None) -> None:
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        set_system_state(conn, "adapter_last_success_ms", str(now_ms))
 
     @staticmethod
     def _record_adapter_error(conn) -> None:
@@ -492,7 +570,7 @@ class Orchestrator:
         safety_config = self.settings.raw.get("safety", {})
         reconcile_interval_sec = int(safety_config.get("reconcile_interval_sec", 0))
         next_reconcile_ms = int(time.time() * 1000)
-        last_heartbeat_ms = 0
+        last_heartbeat_mono_ms: Optional[int] = None
         idle_backoff_sec = idle_sleep_sec
         tick_count = 0
         stop_requested = False
@@ -502,16 +580,31 @@ class Orchestrator:
         halt_recovery_window_ms = (
             int(safety_config.get("halt_recovery_window_sec", 60)) * 1000
         )
-        halt_allowlist = {
-            "SNAPSHOT_STALE",
-            "BACKFILL_WINDOW_EXCEEDED",
-            "RECONCILE_CRITICAL",
-        }
+
+        sleeping = False
 
         def _handle_signal(signum, _frame) -> None:
-            nonlocal stop_requested
+            nonlocal stop_requested, sleeping
             stop_requested = True
             logger.info("loop_stop_requested", extra={"signal": signum})
+            # time.sleep resumes after a handler returns (PEP 475); raising cuts the
+            # idle sleep short instead of waiting out the backoff. Clearing the flag
+            # first means a second signal never raises outside _sleep's try block.
+            if sleeping:
+                sleeping = False
+                raise _SleepInterrupted
+
+        def _sleep(seconds: float) -> None:
+            nonlocal sleeping, stop_requested
+            if stop_requested:
+                return
+            try:
+                sleeping = True
+                time.sleep(seconds)
+                sleeping = False
+            except (_SleepInterrupted, KeyboardInterrupt):
+                sleeping = False
+                stop_requested = True
 
         prev_int = signal.getsignal(signal.SIGINT)
         prev_term = signal.getsignal(signal.SIGTERM)
@@ -527,7 +620,12 @@ class Orchestrator:
                 tick_count += 1
 
                 tick_start_ms = int(time.time() * 1000)
+                # Durations and the heartbeat use the monotonic clock so NTP steps
+                # cannot produce negative or inflated tick times.
+                tick_start_mono_ms = time.monotonic_ns() // 1_000_000
                 set_system_state(conn, "loop_last_tick_started_ms", str(tick_start_ms))
+                # Bookkeeping written once, with loop_last_tick_ms, at the end of the tick.
+                pending_state: list[tuple[str, str]] = []
 
                 now_ms = tick_start_ms
                 raw_reconcile = None
@@ -570,10 +668,8 @@ class Orchestrator:
                         noncritical_count += 1
                     else:
                         noncritical_count = 0
-                    set_system_state(
-                        conn,
-                        "halt_recovery_noncritical_count",
-                        str(noncritical_count),
+                    pending_state.append(
+                        ("halt_recovery_noncritical_count", str(noncritical_count))
                     )
 
                     if self._should_auto_recover_halt(
@@ -582,7 +678,7 @@ class Orchestrator:
                         safety_reason=safety_reason,
                         raw_reconcile=raw_reconcile,
                         noncritical_count=noncritical_count,
-                        allowlist=halt_allowlist,
+                        allowlist=_HALT_AUTO_RECOVERY_REASONS,
                         window_ms=halt_recovery_window_ms,
                         required_noncritical=halt_noncritical_required,
                     ):
@@ -605,10 +701,10 @@ class Orchestrator:
                             reason_message="Auto-recovered to reduce-only after HALT",
                             audit_recorder=audit_recorder,
                         )
-                        set_system_state(conn, "halt_recovery_noncritical_count", "0")
+                        pending_state.append(("halt_recovery_noncritical_count", "0"))
                         safety_mode = "HALT"
                 else:
-                    set_system_state(conn, "halt_recovery_noncritical_count", "0")
+                    pending_state.append(("halt_recovery_noncritical_count", "0"))
 
                 events: List[PositionDeltaEvent] = []
                 if coordinator is not None and safety_mode != "HALT":
@@ -623,10 +719,7 @@ class Orchestrator:
                             "safety_mode": safety_mode,
                         },
                     )
-                    try:
-                        time.sleep(idle_backoff_sec)
-                    except KeyboardInterrupt:
-                        stop_requested = True
+                    sleep_sec = idle_backoff_sec
                     idle_backoff_sec = min(max_idle_sleep_sec, idle_backoff_sec * 2)
                 elif events:
                     results = pipeline.process_events(events)
@@ -638,11 +731,7 @@ class Orchestrator:
                         },
                     )
                     idle_backoff_sec = idle_sleep_sec
-                    if active_sleep_sec > 0:
-                        try:
-                            time.sleep(active_sleep_sec)
-                        except KeyboardInterrupt:
-                            stop_requested = True
+                    sleep_sec = active_sleep_sec
                 else:
                     logger.info(
                         "loop_idle",
@@ -650,15 +739,16 @@ class Orchestrator:
                             "sleep_sec": idle_backoff_sec,
                         },
                     )
-                    try:
-                        time.sleep(idle_backoff_sec)
-                    except KeyboardInterrupt:
-                        stop_requested = True
+                    sleep_sec = idle_backoff_sec
                     idle_backoff_sec = min(max_idle_sleep_sec, idle_backoff_sec * 2)
+                if sleep_sec > 0:
+                    _sleep(sleep_sec)
 
                 tick_end_ms = int(time.time() * 1000)
-                set_system_state(conn, "loop_last_tick_ms", str(tick_end_ms))
-                tick_duration_ms = tick_end_ms - tick_start_ms
+                tick_end_mono_ms = time.monotonic_ns() // 1_000_000
+                pending_state.append(("loop_last_tick_ms", str(tick_end_ms)))
+                set_system_state_many(conn, pending_state)
+                tick_duration_ms = tick_end_mono_ms - tick_start_mono_ms
                 if tick_duration_ms >= tick_warn_ms:
                     logger.warning(
                         "loop_tick_slow",
@@ -666,10 +756,13 @@ class Orchestrator:
                     )
                 metrics.emit("loop_tick_duration_ms", tick_duration_ms)
 
-                if tick_end_ms - last_heartbeat_ms >= heartbeat_ms:
+                if (
+                    last_heartbeat_mono_ms is None
+                    or tick_end_mono_ms - last_heartbeat_mono_ms >= heartbeat_ms
+                ):
                     metrics.emit("loop_alive", 1)
                     logger.info("loop_heartbeat", extra={"last_tick_ms": tick_end_ms})
-                    last_heartbeat_ms = tick_end_ms
+                    last_heartbeat_mono_ms = tick_end_mono_ms
         finally:
             signal.signal(signal.SIGINT, prev_int)
             signal.signal(signal.SIGTERM, prev_term)
@@ -683,7 +776,7 @@ class Orchestrator:
         safety_reason: str,
         raw_reconcile: ReconciliationResult | None,
         noncritical_count: int,
-        allowlist: set[str],
+        allowlist: frozenset[str],
         window_ms: int,
         required_noncritical: int,
     ) -> bool:
@@ -693,8 +786,9 @@ class Orchestrator:
             return False
         if raw_reconcile.reason_code == "SNAPSHOT_STALE":
             return False
-        last_success_ms = int(get_system_state(conn, "adapter_last_success_ms") or 0)
-        last_error_ms = int(get_system_state(conn, "adapter_last_error_ms") or 0)
+        adapter_state = get_system_state_many(conn, _ADAPTER_HEALTH_KEYS)
+        last_success_ms = int(adapter_state.get("adapter_last_success_ms") or 0)
+        last_error_ms = int(adapter_state.get("adapter_last_error_ms") or 0)
         if now_ms - last_success_ms > window_ms:
             return False
         if last_error_ms and now_ms - last_error_ms <= window_ms:
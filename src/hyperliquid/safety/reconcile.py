@@ -8,20 +8,20 @@ import time
 from hyperliquid.common.models import normalize_symbol
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PositionSnapshot:
     source: str
     positions: Dict[str, float]
     timestamp_ms: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DriftReport:
     drifts: Dict[str, float]
     max_drift: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ReconciliationResult:
     mode: str
     reason_code: str
@@ -64,6 +64,17 @@ class SafetyService:
             critical_threshold=critical_threshold,
             snapshot_max_stale_ms=snapshot_max_stale_ms,
         )
+        return self.apply_reconcile_policy(
+            result, current_state, allow_auto_promote=allow_auto_promote
+        )
+
+    def apply_reconcile_policy(
+        self,
+        result: ReconciliationResult,
+        current_state: SafetyState | None,
+        *,
+        allow_auto_promote: bool = False,
+    ) -> ReconciliationResult:
         if current_state is None:
             return result
         next_mode = _apply_reconcile_policy(
@@ -3,7 +3,7 @@ from __future__ import annotations
 import sqlite3
 import time
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 DB_SCHEMA_VERSION = "4"
 
@@ -21,6 +21,22 @@ def init_db(db_path: str) -> sqlite3.Connection:
     return conn
 
 
+# Tuning for the long-lived orchestrator connection. journal_mode=WAL is persistent
+# in the DB file; synchronous=NORMAL is durable across crashes in WAL mode.
+_RUNTIME_PRAGMAS = (
+    "PRAGMA journal_mode = WAL;",
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA temp_store = MEMORY;",
+    "PRAGMA cache_size = -65536;",
+    "PRAGMA mmap_size = 268435456;",
+)
+
+
+def apply_runtime_pragmas(conn: sqlite3.Connection) -> None:
+    for pragma in _RUNTIME_PRAGMAS:
+        conn.execute(pragma)
+
+
 def _create_tables(conn: sqlite3.Connection) -> None:
     conn.executescript(
         """
@@ -165,6 +181,17 @@ def get_system_state(conn: sqlite3.Connection, key: str) -> Optional[str]:
     return str(row[0])
 
 
+def get_system_state_many(conn: sqlite3.Connection, keys: Iterable[str]) -> dict[str, str]:
+    keys = tuple(keys)
+    if not keys:
+        return {}
+    placeholders = ", ".join("?" * len(keys))
+    rows = conn.execute(
+        f"SELECT key, value FROM system_state WHERE key IN ({placeholders})", keys
+    ).fetchall()
+    return {str(key): str(value) for key, value in rows}
+
+
 def set_system_state(
     conn: sqlite3.Connection, key: str, value: str, *, commit: bool = True
 ) -> None:
@@ -178,6 +205,32 @@ def set_system_state(
         conn.commit()
 
 
+def set_system_state_many(
+    conn: sqlite3.Connection, pairs: Iterable[tuple[str, str]], *, commit: bool = True
+) -> None:
+    now_ms = _now_ms()
+    conn.executemany(
+        "INSERT INTO system_state(key, value, updated_at_ms) "
+        "VALUES(?, ?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value=excluded.value, updated_at_ms=excluded.updated_at_ms",
+        [(key, value, now_ms) for key, value in pairs],
+    )
+    if commit:
+        conn.commit()
+
+
+def set_system_states_if_missing(
+    conn: sqlite3.Connection, pairs: Iterable[tuple[str, str]], *, commit: bool = True
+) -> None:
+    now_ms = _now_ms()
+    conn.executemany(
+        "INSERT OR IGNORE INTO system_state(key, value, updated_at_ms) VALUES(?, ?, ?)",
+        [(key, value, now_ms) for key, value in pairs],
+    )
+    if commit:
+        conn.commit()
+
+
 def event_key(timestamp_ms: int, event_index: int, tx_hash: str, symbol: str) -> str:
     return f"{timestamp_ms}|{event_index}|{tx_hash}|{symbol}"
 
@@ -192,6 +245,28 @@ def has_processed_tx(
     return row is not None
 
 
+# 3 bound parameters per key keeps each chunk under SQLite's legacy 999-variable limit.
+_PROCESSED_TX_CHUNK = 300
+
+
+def processed_tx_keys(
+    conn: sqlite3.Connection, keys: Iterable[tuple[str, int, str]]
+) -> set[tuple[str, int, str]]:
+    keys = list(keys)
+    present: set[tuple[str, int, str]] = set()
+    for start in range(0, len(keys), _PROCESSED_TX_CHUNK):
+        chunk = keys[start : start + _PROCESSED_TX_CHUNK]
+        values = ", ".join("(?, ?, ?)" for _ in chunk)
+        params = [part for key in chunk for part in key]
+        rows = conn.execute(
+            "SELECT tx_hash, event_index, symbol FROM processed_txs "
+            f"WHERE (tx_hash, event_index, symbol) IN (VALUES {values})",
+            params,
+        ).fetchall()
+        present.update((str(tx_hash), int(index), str(symbol)) for tx_hash, index, symbol in rows)
+    return present
+
+
 def record_processed_tx(
     conn: sqlite3.Connection,
     *,
@@ -212,6 +287,24 @@ def record_processed_tx(
         conn.commit()
 
 
+# Rows are (tx_hash, event_index, symbol, timestamp_ms, is_replay).
+def record_processed_txs(
+    conn: sqlite3.Connection,
+    rows: Iterable[tuple[str, int, str, int, int]],
+    *,
+    commit: bool = True,
+) -> None:
+    created_at_ms = _now_ms()
+    conn.executemany(
+        "INSERT OR IGNORE INTO processed_txs("
+        "tx_hash, event_index, symbol, timestamp_ms, is_replay, created_at_ms"
+        ") VALUES(?, ?, ?, ?, ?, ?)",
+        [(*row, created_at_ms) for row in rows],
+    )
+    if commit:
+        conn.commit()
+
+
 def cleanup_processed_txs(conn: sqlite3.Connection, *, dedup_ttl_seconds: int) -> int:
     if dedup_ttl_seconds < 0:
         raise ValueError("dedup_ttl_seconds must be >= 0")
@@ -4,7 +4,7 @@ import time
 from dataclasses import dataclass
 from typing import Callable, Optional
 
-from hyperliquid.storage.db import get_system_state, set_system_state
+from hyperliquid.storage.db import get_system_state, get_system_state_many, set_system_state_many
 from hyperliquid.storage.persistence import AuditLogEntry
 
 
@@ -16,13 +16,22 @@ class SafetyState:
     changed_at_ms: int
 
 
+_SAFETY_STATE_KEYS = (
+    "safety_mode",
+    "safety_reason_code",
+    "safety_reason_message",
+    "safety_changed_at_ms",
+)
+
+
 def load_safety_state(conn) -> Optional[SafetyState]:
-    mode = get_system_state(conn, "safety_mode")
+    state = get_system_state_many(conn, _SAFETY_STATE_KEYS)
+    mode = state.get("safety_mode")
     if mode is None:
         return None
-    reason_code = get_system_state(conn, "safety_reason_code") or ""
-    reason_message = get_system_state(conn, "safety_reason_message") or ""
-    changed_at_raw = get_system_state(conn, "safety_changed_at_ms") or "0"
+    reason_code = state.get("safety_reason_code") or ""
+    reason_message = state.get("safety_reason_message") or ""
+    changed_at_raw = state.get("safety_changed_at_ms") or "0"
     return SafetyState(
         mode=mode,
         reason_code=reason_code,
@@ -42,12 +51,16 @@ def set_safety_state(
 ) -> None:
     previous_mode = get_system_state(conn, "safety_mode") or ""
     now_ms = int(time.time() * 1000)
-    set_system_state(conn, "safety_mode", mode, commit=False)
-    set_system_state(conn, "safety_reason_code", reason_code, commit=False)
-    set_system_state(conn, "safety_reason_message", reason_message, commit=False)
-    set_system_state(conn, "safety_changed_at_ms", str(now_ms), commit=False)
-    if commit:
-        conn.commit()
+    set_system_state_many(
+        conn,
+        (
+            ("safety_mode", mode),
+            ("safety_reason_code", reason_code),
+            ("safety_reason_message", reason_message),
+            ("safety_changed_at_ms", str(now_ms)),
+        ),
+        commit=commit,
+    )
     if audit_recorder is not None and previous_mode != mode:
         try:
             audit_recorder(
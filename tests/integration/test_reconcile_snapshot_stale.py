@@ -73,3 +73,36 @@ def test_reconcile_stale_snapshot_sets_armed_safe() -> None:
             assert get_system_state(conn, "safety_reason_code") == "SNAPSHOT_STALE"
         finally:
             conn.close()
+
+
+def test_reconcile_repeat_result_keeps_safety_changed_at() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = Path(tmp_dir)
+        settings = _build_settings(root)
+        conn = init_db(settings.db_path)
+        try:
+            adapter = _StaleAdapter(int(time.time() * 1000) - 10_000)
+            safety = SafetyService(safety_mode_provider=lambda: "ARMED_LIVE")
+            services = {"safety": safety, "execution": ExecutionService(adapter=adapter)}
+            orchestrator = Orchestrator(settings=settings, mode="dry-run")
+            logger = logging.getLogger("test.stale_snapshot_repeat")
+
+            def _reconcile() -> None:
+                orchestrator._run_reconcile(
+                    services,
+                    conn,
+                    logger,
+                    _DummyMetrics(),
+                    allow_auto_promote=False,
+                    context="loop",
+                )
+
+            _reconcile()
+            conn.execute("UPDATE system_state SET value = '1' WHERE key = 'safety_changed_at_ms'")
+            conn.commit()
+            _reconcile()
+
+            assert get_system_state(conn, "safety_reason_code") == "SNAPSHOT_STALE"
+            assert get_system_state(conn, "safety_changed_at_ms") == "1"
+        finally:
+            conn.close()
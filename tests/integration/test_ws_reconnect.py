@@ -100,7 +100,7 @@ def test_ws_reconnect_falls_back_to_rest_and_dedups(monkeypatch) -> None:
 
             monkeypatch.setattr(adapter, "_poll_live_rest", _poll_live_rest)
             adapter._ws_enabled = True
-            adapter._last_ws_message_ms = 0
+            adapter._last_ws_message_ns = None
 
             events = coordinator.run_once(conn, mode="live")
 
@@ -103,7 +103,7 @@ def test_ws_reconnect_backfill_overlap_dedup(monkeypatch) -> None:
             monkeypatch.setattr(adapter, "_post_json", _post_json)
             monkeypatch.setattr(adapter, "_poll_live_rest", _poll_live_rest)
             adapter._ws_enabled = True
-            adapter._last_ws_message_ms = 0
+            adapter._last_ws_message_ns = None
 
             events = coordinator.run_once(conn, mode="live")
 
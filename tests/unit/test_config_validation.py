@@ -1,3 +1,5 @@
+import json
+import sys
 from pathlib import Path
 
 import jsonschema
@@ -64,3 +66,84 @@ def test_validate_config_rejects_unknown_top_level_key() -> None:
     except jsonschema.ValidationError:
         return
     raise AssertionError("Expected ValidationError for unknown top-level key")
+
+
+def test_validate_config_reuses_compiled_schema_until_file_changes(tmp_path: Path) -> None:
+    from hyperliquid.common import settings
+
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text('{"type": "object", "required": ["a"]}')
+    settings._compiled_validator.cache_clear()
+
+    validate_config({"a": 1}, schema_path)
+    validate_config({"a": 2}, schema_path)
+    assert settings._compiled_validator.cache_info().misses == 1
+
+    schema_path.write_text('{"type": "object", "required": ["a", "bb"]}')
+    try:
+        validate_config({"a": 1}, schema_path)
+    except jsonschema.ValidationError:
+        pass
+    else:
+        raise AssertionError("Expected ValidationError after schema change")
+
+
+def test_load_settings_can_skip_schema_validation(tmp_path: Path) -> None:
+    from hyperliquid.common.settings import load_settings
+
+    config = _base_config()
+    config["environment"] = "not-an-env"
+    config_path = tmp_path / "settings.yaml"
+    config_path.write_text(json.dumps(config))
+
+    settings = load_settings(config_path, tmp_path / "missing.json", validate=False)
+    assert settings.environment == "not-an-env"
+
+
+def test_load_settings_reuses_result_until_config_changes(tmp_path: Path, monkeypatch) -> None:
+    import os
+
+    from hyperliquid.common import settings as settings_module
+    from hyperliquid.common.settings import load_settings
+
+    config_path = tmp_path / "settings.yaml"
+    config_path.write_text(json.dumps(_base_config()))
+    parsed: list[Path] = []
+    load_yaml = settings_module.load_yaml
+
+    def _counting_load_yaml(path: Path):
+        parsed.append(path)
+        return load_yaml(path)
+
+    monkeypatch.setattr(settings_module, "load_yaml", _counting_load_yaml)
+
+    first = load_settings(config_path, _schema_path())
+    repeat = load_settings(config_path, _schema_path())
+    assert repeat == first
+    assert len(parsed) == 1
+
+    first.raw["log_level"] = "mutated"
+    assert load_settings(config_path, _schema_path()).raw["log_level"] == "INFO"
+
+    updated = _base_config()
+    updated["log_level"] = "DEBUG"
+    config_path.write_text(json.dumps(updated))
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second = load_settings(config_path, _schema_path())
+    assert len(parsed) == 2
+    assert second.log_level == "DEBUG"
+
+
+def test_load_settings_interns_string_values(tmp_path: Path) -> None:
+    from hyperliquid.common.settings import load_settings
+
+    config = _base_config()
+    config["ingest"] = {"hyperliquid": {"symbol_map": {"BTC": "BTC" + "USDT"}}}
+    config_path = tmp_path / "settings.yaml"
+    config_path.write_text(json.dumps(config))
+
+    settings = load_settings(config_path, _schema_path())
+    symbol = settings.raw["ingest"]["hyperliquid"]["symbol_map"]["BTC"]
+    assert symbol is sys.intern("BTCUSDT")
@@ -1,5 +1,5 @@
 from hyperliquid.ingest.service import IngestService, RawPositionEvent
-from hyperliquid.storage.db import get_system_state, has_processed_tx
+from hyperliquid.storage.db import get_system_state, has_processed_tx, processed_tx_keys
 
 
 def test_cursor_persists_newest_event(db_conn) -> None:
@@ -44,3 +44,31 @@ def test_dedup_persistence_blocks_replay(db_conn) -> None:
     assert has_processed_tx(db_conn, raw.tx_hash, raw.event_index, raw.symbol) is True
     second = ingest.ingest_raw_events([raw], db_conn)
     assert second == []
+
+
+def test_dedup_skips_duplicates_within_one_batch(db_conn) -> None:
+    ingest = IngestService()
+    seen = RawPositionEvent(
+        symbol="BTCUSDT",
+        tx_hash="0xseen",
+        event_index=1,
+        prev_target_net_position=0.0,
+        next_target_net_position=1.0,
+        timestamp_ms=1800,
+    )
+    fresh = RawPositionEvent(
+        symbol="BTCUSDT",
+        tx_hash="0xfresh",
+        event_index=2,
+        prev_target_net_position=1.0,
+        next_target_net_position=2.0,
+        timestamp_ms=1900,
+    )
+    ingest.ingest_raw_events([seen], db_conn)
+
+    events = ingest.ingest_raw_events([seen, fresh, fresh], db_conn)
+
+    assert [event.tx_hash for event in events] == ["0xfresh"]
+    assert processed_tx_keys(
+        db_conn, [("0xseen", 1, "BTCUSDT"), ("0xfresh", 2, "BTCUSDT"), ("0xmissing", 3, "BTCUSDT")]
+    ) == {("0xseen", 1, "BTCUSDT"), ("0xfresh", 2, "BTCUSDT")}
@@ -2,6 +2,13 @@ import sqlite3
 import time
 
 from hyperliquid.common.models import OrderIntent, OrderResult
+from hyperliquid.storage.db import (
+    apply_runtime_pragmas,
+    get_system_state_many,
+    set_system_state,
+    set_system_state_many,
+    set_system_states_if_missing,
+)
 from hyperliquid.storage.persistence import DbPersistence
 
 
@@ -211,3 +218,42 @@ def test_db_persistence_ensure_intent_mismatch_raises(db_conn) -> None:
         assert "Intent payload mismatch" in str(exc)
     else:
         raise AssertionError("Expected mismatch to raise ValueError")
+
+
+def test_get_system_state_many_returns_only_present_keys(db_conn) -> None:
+    set_system_state(db_conn, "safety_mode", "HALT")
+    set_system_state(db_conn, "last_processed_timestamp_ms", "1200")
+
+    state = get_system_state_many(
+        db_conn, ("safety_mode", "safety_reason_code", "last_processed_timestamp_ms")
+    )
+
+    assert state == {"safety_mode": "HALT", "last_processed_timestamp_ms": "1200"}
+    assert get_system_state_many(db_conn, ()) == {}
+
+
+def test_set_system_states_if_missing_keeps_existing_values(db_conn) -> None:
+    set_system_state(db_conn, "safety_mode", "HALT")
+
+    set_system_states_if_missing(
+        db_conn, [("safety_mode", "ARMED_SAFE"), ("safety_reason_code", "BOOTSTRAP")]
+    )
+
+    state = get_system_state_many(db_conn, ("safety_mode", "safety_reason_code"))
+    assert state == {"safety_mode": "HALT", "safety_reason_code": "BOOTSTRAP"}
+
+
+def test_apply_runtime_pragmas_enables_wal(db_conn) -> None:
+    apply_runtime_pragmas(db_conn)
+
+    assert _fetch_one(db_conn, "PRAGMA journal_mode", ())[0] == "wal"
+    assert _fetch_one(db_conn, "PRAGMA synchronous", ())[0] == 1
+
+
+def test_set_system_state_many_upserts_all_pairs(db_conn) -> None:
+    set_system_state(db_conn, "safety_mode", "ARMED_SAFE")
+
+    set_system_state_many(db_conn, [("safety_mode", "HALT"), ("safety_reason_code", "TEST")])
+
+    state = get_system_state_many(db_conn, ("safety_mode", "safety_reason_code"))
+    assert state == {"safety_mode": "HALT", "safety_reason_code": "TEST"}
@@ -0,0 +1,30 @@
+from hyperliquid.ingest.service import IngestService
+
+
+def test_action_type_is_derived_from_position_transition() -> None:
+    ingest = IngestService()
+    cases = [
+        (0.0, 0.0, "DECREASE"),
+        (0.0, 1.0, "INCREASE"),
+        (0.0, -1.0, "INCREASE"),
+        (2.0, 3.0, "INCREASE"),
+        (2.0, 1.0, "DECREASE"),
+        (2.0, 2.0, "INCREASE"),
+        (2.0, 0.0, "DECREASE"),
+        (2.0, -1.0, "FLIP"),
+        (-2.0, -3.0, "INCREASE"),
+        (-2.0, -1.0, "DECREASE"),
+        (-2.0, 0.0, "DECREASE"),
+        (-2.0, 1.0, "FLIP"),
+    ]
+
+    for prev, next_, expected in cases:
+        event = ingest.build_position_delta_event(
+            symbol="BTCUSDT",
+            tx_hash="0xaction",
+            event_index=1,
+            prev_target_net_position=prev,
+            next_target_net_position=next_,
+            timestamp_ms=1,
+        )
+        assert event.action_type == expected, (prev, next_)
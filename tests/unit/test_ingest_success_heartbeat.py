@@ -0,0 +1,55 @@
+from hyperliquid.ingest.coordinator import IngestCoordinator, IngestRuntimeConfig
+from hyperliquid.ingest.service import IngestService, RawPositionEvent
+from hyperliquid.storage.db import get_system_state
+
+
+class _QuietAdapter:
+    def __init__(self) -> None:
+        self.backfill: list[RawPositionEvent] = []
+
+    def fetch_backfill_with_status(self, *, since_ms: int, until_ms: int):
+        _ = since_ms, until_ms
+        events, self.backfill = self.backfill, []
+        return events, True
+
+    def poll_live_events_with_status(self, *, since_ms: int):
+        _ = since_ms
+        return [], True
+
+
+def test_idle_polls_refresh_ingest_success_every_poll(db_conn, monkeypatch) -> None:
+    clock = {"now": 1_000.0}
+    monkeypatch.setattr("hyperliquid.ingest.coordinator.time.time", lambda: clock["now"])
+    adapter = _QuietAdapter()
+    coordinator = IngestCoordinator(
+        ingest_service=IngestService(),
+        adapter=adapter,  # type: ignore[arg-type]
+        runtime=IngestRuntimeConfig(
+            backfill_window_ms=600_000, cursor_overlap_ms=0, maintenance_skip_gap=False
+        ),
+    )
+
+    coordinator.run_once(db_conn, mode="live")
+    assert get_system_state(db_conn, "last_ingest_success_ms") == "1000000"
+
+    clock["now"] = 1_030.0
+    coordinator.run_once(db_conn, mode="live")
+    assert get_system_state(db_conn, "last_ingest_success_ms") == "1030000"
+
+    adapter.backfill = [
+        RawPositionEvent(
+            symbol="BTCUSDT",
+            tx_hash="0xbeat",
+            event_index=1,
+            prev_target_net_position=0.0,
+            next_target_net_position=1.0,
+            timestamp_ms=1_030_000,
+        )
+    ]
+    clock["now"] = 1_031.0
+    coordinator.run_once(db_conn, mode="live")
+    assert get_system_state(db_conn, "last_ingest_success_ms") == "1031000"
+
+    clock["now"] = 1_091.0
+    coordinator.run_once(db_conn, mode="live")
+    assert get_system_state(db_conn, "last_ingest_success_ms") == "1091000"
@@ -0,0 +1,66 @@
+import json
+import logging
+import threading
+
+from hyperliquid.common.metrics import MetricsEmitter
+
+
+def test_metrics_emitter_writes_pending_lines_on_close(tmp_path) -> None:
+    path = tmp_path / "metrics.log"
+    metrics = MetricsEmitter(str(path))
+
+    metrics.emit("heartbeat", 1)
+    metrics.emit("loop_tick_duration_ms", 12, tags={"mode": "ARMED_SAFE"})
+    metrics.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    assert lines[0].startswith("[METRICS] ")
+    first = json.loads(lines[0][len("[METRICS] "):])
+    second = json.loads(lines[1][len("[METRICS] "):])
+    assert (first["name"], first["value"], first["tags"]) == ("heartbeat", 1, {})
+    assert second["tags"] == {"mode": "ARMED_SAFE"}
+
+
+def test_metrics_emitter_reports_dropped_lines(tmp_path, monkeypatch, caplog) -> None:
+    monkeypatch.setattr(logging.getLogger("hyperliquid"), "propagate", True)
+    monkeypatch.setattr("hyperliquid.common.metrics._MAX_PENDING_LINES", 2)
+    monkeypatch.setattr("hyperliquid.common.metrics._FLUSH_INTERVAL_SEC", 60.0)
+    path = tmp_path / "metrics.log"
+    metrics = MetricsEmitter(str(path))
+
+    for value in range(5):
+        metrics.emit("heartbeat", value)
+    with caplog.at_level(logging.WARNING, logger="hyperliquid"):
+        metrics.close()
+
+    values = [json.loads(line[len("[METRICS] "):])["value"] for line in path.read_text().splitlines()]
+    assert values == [3, 4]
+    dropped = [record for record in caplog.records if record.getMessage() == "metrics_lines_dropped"]
+    assert [record.dropped_lines for record in dropped] == [3]
+
+
+def test_metrics_writer_survives_flush_errors(tmp_path, monkeypatch, caplog) -> None:
+    monkeypatch.setattr(logging.getLogger("hyperliquid"), "propagate", True)
+    monkeypatch.setattr("hyperliquid.common.metrics._FLUSH_INTERVAL_SEC", 0.01)
+    path = tmp_path / "metrics.log"
+    metrics = MetricsEmitter(str(path))
+    failed = threading.Event()
+    real_write = metrics._file.write
+
+    def _write(text: str) -> int:
+        if not failed.is_set():
+            failed.set()
+            raise OSError("disk full")
+        return real_write(text)
+
+    monkeypatch.setattr(metrics._file, "write", _write, raising=False)
+    with caplog.at_level(logging.ERROR, logger="hyperliquid"):
+        metrics.emit("heartbeat", 1)
+        assert failed.wait(1.0)
+        metrics.emit("heartbeat", 2)
+        metrics.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line[len("[METRICS] "):])["value"] for line in lines] == [2]
+    assert any(record.getMessage() == "metrics_flush_failed" for record in caplog.records)
@@ -0,0 +1,59 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+import yaml
+
+
+def test_ops_rebuild_db_backup_keeps_wal_transactions(tmp_path, monkeypatch) -> None:
+    config_path = tmp_path / "settings.yaml"
+    db_path = tmp_path / "app.db"
+    backup_path = tmp_path / "app.db.bak"
+    config = {
+        "config_version": "test",
+        "environment": "local",
+        "db_path": str(db_path),
+        "metrics_log_path": str(tmp_path / "metrics.log"),
+        "app_log_path": str(tmp_path / "app.log"),
+        "log_level": "INFO",
+    }
+    config_path.write_text(yaml.safe_dump(config))
+
+    # Keep a connection open so the committed row stays in the -wal sidecar.
+    writer = sqlite3.connect(str(db_path))
+    writer.execute("PRAGMA journal_mode=WAL")
+    writer.execute("PRAGMA wal_autocheckpoint=0")
+    writer.execute("CREATE TABLE marker (value TEXT)")
+    writer.execute("INSERT INTO marker (value) VALUES ('in-wal')")
+    writer.commit()
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "ops_rebuild_db.py",
+            "--config",
+            str(config_path),
+            "--schema",
+            str(Path("config/schema.json")),
+            "--backup",
+            "--backup-path",
+            str(backup_path),
+            "--force",
+        ],
+    )
+
+    from tools import ops_rebuild_db
+
+    try:
+        rc = ops_rebuild_db.main()
+    finally:
+        writer.close()
+
+    assert rc == 0
+    backup = sqlite3.connect(str(backup_path))
+    try:
+        rows = backup.execute("SELECT value FROM marker").fetchall()
+    finally:
+        backup.close()
+    assert rows == [("in-wal",)]
@@ -1,4 +1,6 @@
 import logging
+import os
+import signal
 from pathlib import Path
 
 from hyperliquid.common.metrics import MetricsEmitter
@@ -138,6 +140,27 @@ def test_loop_handles_keyboard_interrupt(db_conn, db_path, tmp_path, monkeypatch
     metrics.close()
 
 
+def test_loop_signal_interrupts_idle_sleep(db_conn, db_path, tmp_path, monkeypatch) -> None:
+    settings = _build_settings(db_path, tmp_path, ingest_enabled=False)
+    logger = logging.getLogger("test_loop_signal")
+    metrics = MetricsEmitter(str(tmp_path / "metrics_loop_signal.log"))
+    orchestrator = Orchestrator(settings=settings, mode="dry-run", emit_boot_event=False)
+    services = orchestrator._initialize_services(db_conn, logger)
+
+    sleeps: list[float] = []
+
+    def _sleep_until_signal(value: float) -> None:
+        sleeps.append(value)
+        os.kill(os.getpid(), signal.SIGTERM)
+        raise AssertionError("sleep was not interrupted by the stop signal")
+
+    monkeypatch.setattr("time.sleep", _sleep_until_signal)
+    orchestrator._run_loop(services, db_conn, logger, metrics, max_ticks=5)
+
+    assert sleeps == [1]
+    metrics.close()
+
+
 def test_halt_auto_recovery_backfill_window(db_conn, db_path, tmp_path, monkeypatch) -> None:
     settings = _build_settings(
         db_path,
@@ -216,3 +239,55 @@ def test_halt_auto_recovery_requires_consecutive_ok(db_conn, db_path, tmp_path,
     assert get_system_state(db_conn, "safety_mode") == "ARMED_SAFE"
     assert get_system_state(db_conn, "safety_reason_code") == "HALT_RECOVERY_AUTO"
     metrics.close()
+
+
+def test_bootstrap_state_seeds_defaults_on_empty_db(db_conn, monkeypatch) -> None:
+    db_conn.execute("DELETE FROM system_state")
+    monkeypatch.setattr("time.time", lambda: 50.0)
+
+    Orchestrator._ensure_bootstrap_state(db_conn)
+
+    assert get_system_state(db_conn, "last_processed_timestamp_ms") == "0"
+    assert get_system_state(db_conn, "last_ingest_success_ms") == "50000"
+    assert get_system_state(db_conn, "last_processed_event_key") == ""
+    assert get_system_state(db_conn, "safety_mode") == "ARMED_SAFE"
+    assert get_system_state(db_conn, "safety_reason_code") == "BOOTSTRAP"
+    assert get_system_state(db_conn, "safety_changed_at_ms") == "50000"
+
+
+def test_price_provider_follows_adapter_swaps(db_conn, db_path, tmp_path) -> None:
+    settings = _build_settings(db_path, tmp_path, ingest_enabled=False)
+    orchestrator = Orchestrator(settings=settings, mode="dry-run", emit_boot_event=False)
+    services = orchestrator._initialize_services(db_conn, logging.getLogger("test_price"))
+    price_provider = services["decision"].price_provider
+
+    class _PricedAdapter:
+        def __init__(self, price: float) -> None:
+            self.price = price
+
+        def fetch_mark_price(self, _symbol: str) -> float:
+            return self.price
+
+    assert price_provider("BTCUSDT") is None
+    services["execution"].adapter = _PricedAdapter(100.0)
+    assert price_provider("BTCUSDT").price == 100.0
+    services["execution"].adapter = _PricedAdapter(200.0)
+    assert price_provider("BTCUSDT").price == 200.0
+    services["execution"].adapter = object()
+    assert price_provider("BTCUSDT") is None
+
+
+def test_config_hash_change_keeps_mode_unless_halted(db_conn) -> None:
+    logger = logging.getLogger("test_config_hash")
+    set_system_state(db_conn, "config_hash", "old")
+    set_safety_state(db_conn, mode="ARMED_LIVE", reason_code="OK", reason_message="ok")
+
+    Orchestrator._handle_config_hash(db_conn, "new", logger)
+
+    assert get_system_state(db_conn, "safety_mode") == "ARMED_LIVE"
+    assert get_system_state(db_conn, "safety_reason_code") == "CONFIG_HASH_CHANGED"
+
+    set_safety_state(db_conn, mode="HALT", reason_code="RECONCILE_CRITICAL", reason_message="x")
+    Orchestrator._handle_config_hash(db_conn, "newer", logger)
+
+    assert get_system_state(db_conn, "safety_reason_code") == "RECONCILE_CRITICAL"
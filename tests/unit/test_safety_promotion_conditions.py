@@ -67,3 +67,29 @@ def test_stays_armed_safe_when_auto_promote_disabled(monkeypatch) -> None:
     )
     assert result.mode == "ARMED_SAFE"
     assert result.reason_code == "RECONCILE_WARN"
+
+
+def test_apply_reconcile_policy_layers_state_over_raw_result(monkeypatch) -> None:
+    service = SafetyService(safety_mode_provider=_safety_mode_provider)
+    monkeypatch.setattr("hyperliquid.safety.reconcile.time.time", lambda: 10.0)
+    local, exchange = _snapshots(10000)
+    raw = service.reconcile_snapshots(
+        local_snapshot=local,
+        exchange_snapshot=exchange,
+        warn_threshold=0.1,
+        critical_threshold=1.0,
+        snapshot_max_stale_ms=1000,
+    )
+    current = SafetyState(
+        mode="HALT",
+        reason_code="RECONCILE_CRITICAL",
+        reason_message="Drift exceeds critical threshold",
+        changed_at_ms=9999,
+    )
+
+    result = service.apply_reconcile_policy(raw, current, allow_auto_promote=True)
+
+    assert raw.mode == "ARMED_LIVE"
+    assert result.mode == "HALT"
+    assert result.reason_code == "RECONCILE_CRITICAL"
+    assert result.report is raw.report
@@ -1,5 +1,5 @@
 import argparse
-import shutil
+import sqlite3
 import time
 from pathlib import Path
 
@@ -12,6 +12,23 @@ def _default_backup_name(db_path: Path) -> Path:
     return db_path.with_suffix(db_path.suffix + f".bak-{stamp}")
 
 
+def _backup_db(db_path: Path, backup_path: Path) -> None:
+    # Connection.backup() reads through SQLite, so transactions still sitting in the
+    # -wal sidecar end up in the backup too (a plain file copy would miss them).
+    src = sqlite3.connect(str(db_path))
+    try:
+        dest = sqlite3.connect(str(backup_path))
+        try:
+            src.backup(dest)
+            result = dest.execute("PRAGMA quick_check").fetchone()
+        finally:
+            dest.close()
+    finally:
+        src.close()
+    if result is None or result[0] != "ok":
+        raise SystemExit(f"backup verification failed: {backup_path}")
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Rebuild SQLite DB with schema.")
     parser.add_argument("--config", required=True, help="Path to settings.yaml")
@@ -39,11 +56,15 @@ def main() -> int:
         if args.backup:
             backup_path = Path(args.backup_path) if args.backup_path else _default_backup_name(db_path)
             backup_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(db_path, backup_path)
+            _backup_db(db_path, backup_path)
             print(f"backup_path={backup_path}")
         if not args.force:
             raise SystemExit("DB exists; pass --force to rebuild after backup")
         db_path.unlink()
+        # Only reached once any requested backup has been verified. Drop the WAL
+        # sidecars so they are not replayed into the fresh DB.
+        for suffix in ("-wal", "-shm"):
+            Path(f"{db_path}{suffix}").unlink(missing_ok=True)
 
     conn = init_db(str(db_path))
     try: